@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# NumPy-alapú kötegelt szimulátor: egyszerre sok asztalt játszik, mindegyik
+# saját cipővel. A lapok egész értékek (2-9, 10 = tízes értékű lap,
+# 11 = ász), a kezek összegét, a lágy ászt, az osztó húzását és az
+# elszámolást tömbműveletek számolják, a motor szabályaival megegyezően.
+# Az asztalváltozat (engine.RuleSet) keresőtáblái NumPy-tömbökként
+# indexelhetők. A döntéseket a rögzített alapstratégia-táblázat hozza
+# (feladás nélkül).
+
+import numpy as np
+
+from engine import (HIT, STAND, DOUBLE, SPLIT, PLAYER_BUST, DEALER_BUST,
+                    PLAYER_BLACKJACK, DEALER_BLACKJACK, BLACKJACK_PUSH,
+                    PLAYER_HIGHER, DEALER_HIGHER, PUSH, OUTCOME_COUNT, get_rules)
+from strategy import HARD_TABLE, SOFT_TABLE, PAIR_TABLE
+
+# Egy 52 lapos pakli lapértékei
+DECK_VALUES = np.array([2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 11] * 4, dtype=np.int8)
+
+HARD = np.array(HARD_TABLE, dtype=np.int8)
+SOFT = np.array(SOFT_TABLE, dtype=np.int8)
+PAIR = np.array(PAIR_TABLE, dtype=np.int8)
+
+class HandArrays:
+    # Asztalonként több kéz (split) állapota (asztal, kéz) alakú tömbökben
+    def __init__(self, tables, max_hands, bet):
+        self.hard = np.zeros((tables, max_hands), dtype=np.int16)  # ász = 1
+        self.aces = np.zeros((tables, max_hands), dtype=bool)
+        self.count = np.zeros((tables, max_hands), dtype=np.int8)
+        self.first = np.zeros((tables, max_hands), dtype=np.int8)
+        self.pair = np.zeros((tables, max_hands), dtype=bool)
+        self.split = np.zeros((tables, max_hands), dtype=bool)
+        self.bets = np.zeros((tables, max_hands))
+        self.active = np.zeros((tables, max_hands), dtype=bool)
+        self.hands = np.ones(tables, dtype=np.intp)
+
+        self.bets[:, 0] = bet
+        self.active[:, 0] = True
+
+    def grow(self):
+        # Ritka eset: több split, mint ahány kézhely van
+        for name in ('hard', 'aces', 'count', 'first', 'pair', 'split', 'bets', 'active'):
+            array = getattr(self, name)
+            setattr(self, name, np.concatenate([array, np.zeros_like(array)], axis=1))
+
+    def add(self, rows, cols, values):
+        count = self.count[rows, cols]
+        first = np.where(count == 0, values, self.first[rows, cols])
+        self.hard[rows, cols] += np.where(values == 11, 1, values)
+        self.aces[rows, cols] |= values == 11
+        self.first[rows, cols] = first
+        self.pair[rows, cols] = (count == 1) & (first == values)
+        self.count[rows, cols] = count + 1
+
+    def reset(self, rows, cols, values):
+        # Split után a kézben csak egy lap marad
+        self.hard[rows, cols] = np.where(values == 11, 1, values)
+        self.aces[rows, cols] = values == 11
+        self.first[rows, cols] = values
+        self.pair[rows, cols] = False
+        self.split[rows, cols] = True
+        self.count[rows, cols] = 1
+
+    def totals(self, rows, cols):
+        hard = self.hard[rows, cols]
+        soft = self.aces[rows, cols] & (hard + 10 <= 21)
+        return hard + 10 * soft, soft
+
+def hand_totals(hard, aces):
+    # A calculate_value tömbös megfelelője: egy ász 11, ha belefér
+    soft = aces & (hard + 10 <= 21)
+    return hard + 10 * soft
+
+class BatchSimulator:
+    def __init__(self, tables, decks=1, penetration=1.0, seed=None, max_hands=4, rules=None):
+        self.tables = tables
+        self.max_hands = max_hands
+
+        # A szabálykészlet táblái tömbként: payouts[eredmény],
+        # double_table[split kéz-e, összeg], dealer_hits[lágy-e, összeg]
+        rules = get_rules(rules)
+        self.rules = rules
+        self.payouts = np.array(rules.payouts, dtype=float)
+        self.double_table = np.array(rules.double_table, dtype=bool)
+        self.dealer_hits = np.array(rules.dealer_hits, dtype=bool)
+
+        self.rng = np.random.default_rng(seed)
+        self.rows = np.arange(tables)
+
+        # Asztalonként egy cipő, egész lapértékekkel
+        self.shoes = np.tile(DECK_VALUES, (tables, decks))
+        self.rng.permuted(self.shoes, axis=1, out=self.shoes)
+        self.shoe_size = self.shoes.shape[1]
+        self.cut_card = max(1, int(self.shoe_size * penetration))
+        self.positions = np.zeros(tables, dtype=np.intp)
+
+    def shuffle(self, rows):
+        # Helyben keverés, ugyanabban a tömbben
+        self.shoes[rows] = self.rng.permuted(self.shoes[rows], axis=1)
+        self.positions[rows] = 0
+
+    def draw(self, rows):
+        positions = self.positions[rows]
+
+        # Kör közben csak a teljesen kifogyott cipőket keverjük, mint a Shoe.deal
+        empty = positions >= self.shoe_size
+        if empty.any():
+            self.shuffle(rows[empty])
+            positions[empty] = 0
+
+        self.positions[rows] = positions + 1
+        return self.shoes[rows, positions]
+
+    def play_round(self, bet=1.0):
+        rows = self.rows
+        hands = HandArrays(self.tables, self.max_hands, bet)
+
+        # Keverés körök között, ahol elértük a vágókártyát
+        cut = np.flatnonzero(self.positions >= self.cut_card)
+        if cut.size:
+            self.shuffle(cut)
+
+        dealer_hard = np.zeros(self.tables, dtype=np.int16)
+        dealer_aces = np.zeros(self.tables, dtype=bool)
+
+        # Kezdő lapok osztása: játékos, osztó, játékos, osztó
+        hands.add(rows, 0, self.draw(rows))
+        upcards = self.draw(rows)
+        hands.add(rows, 0, self.draw(rows))
+        hole_cards = self.draw(rows)
+        dealer_hard += np.where(upcards == 11, 1, upcards)
+        dealer_hard += np.where(hole_cards == 11, 1, hole_cards)
+        dealer_aces |= (upcards == 11) | (hole_cards == 11)
+        dealer_count = np.full(self.tables, 2, dtype=np.int8)
+
+        # Blackjack esetén automatikusan megállunk
+        totals, _ = hands.totals(rows, 0)
+        hands.active[:, 0] = totals != 21
+
+        slot = 0
+        while slot < hands.hands.max():
+            self.play_slot(hands, slot, upcards)
+            slot += 1
+
+        # Ha minden kéz besült, az osztó nem húz
+        valid = np.arange(hands.hard.shape[1]) < hands.hands[:, None]
+        player_totals = hand_totals(hands.hard, hands.aces)
+        player_busted = player_totals > 21
+        drawing = ~(player_busted | ~valid).all(axis=1)
+
+        # Az osztó a szabálykészlet táblája szerint húz (S17/H17)
+        while True:
+            dealer_soft = dealer_aces & (dealer_hard + 10 <= 21)
+            dealer_totals = dealer_hard + 10 * dealer_soft
+            need = np.flatnonzero(drawing & self.dealer_hits[dealer_soft.astype(np.intp), dealer_totals])
+            if not need.size:
+                break
+            values = self.draw(need)
+            dealer_hard[need] += np.where(values == 11, 1, values)
+            dealer_aces[need] |= values == 11
+            dealer_count[need] += 1
+
+        # Elszámolás a check_winners ágainak sorrendjében
+        dealer_totals = dealer_totals[:, None]
+        dealer_blackjack = ((dealer_count == 2) & (dealer_totals[:, 0] == 21))[:, None]
+        dealer_busted = dealer_totals > 21
+        player_blackjack = (hands.count == 2) & (player_totals == 21)
+        if not self.rules.split_blackjack:
+            player_blackjack &= ~hands.split
+
+        outcomes = np.select(
+            [player_busted,
+             np.broadcast_to(dealer_busted, player_busted.shape),
+             player_blackjack & ~dealer_blackjack,
+             dealer_blackjack & ~player_blackjack,
+             player_blackjack & dealer_blackjack,
+             player_totals > dealer_totals,
+             dealer_totals > player_totals],
+            [PLAYER_BUST, DEALER_BUST, PLAYER_BLACKJACK, DEALER_BLACKJACK,
+             BLACKJACK_PUSH, PLAYER_HIGHER, DEALER_HIGHER],
+            default=PUSH)
+        outcomes = np.where(valid, outcomes, -1)
+
+        payouts = np.where(valid, self.payouts[outcomes] * hands.bets, 0.0)
+        net = (payouts - hands.bets).sum(axis=1)
+        return net, outcomes
+
+    def play_slot(self, hands, slot, upcards):
+        # Egy kézhely lejátszása minden asztalon, amíg van aktív kéz
+        while True:
+            rows = np.flatnonzero(hands.active[:, slot])
+            if not rows.size:
+                return
+
+            totals, soft = hands.totals(rows, slot)
+            up = upcards[rows]
+            actions = np.where(soft, SOFT[totals, up], HARD[totals, up])
+
+            # Szabálytalan split és duplázás sima lapkérésnek számít
+            rules = self.rules
+            first = hands.first[rows, slot]
+            split_hand = hands.split[rows, slot]
+            split = hands.pair[rows, slot] & (PAIR[first, up] == SPLIT)
+            can_split = hands.hands[rows] < rules.max_hands
+            if not rules.resplit_aces:
+                can_split &= ~split_hand | (first != 11)
+            actions = np.where(split, np.where(can_split, SPLIT, HIT), actions)
+
+            can_double = (hands.count[rows, slot] == 2) & self.double_table[split_hand.astype(np.intp), totals]
+            actions = np.where((actions == DOUBLE) & ~can_double, HIT, actions)
+
+            # Egylapos split ász (újrasplitre nyitva hagyva): split helyett
+            # csak megállhat
+            if rules.split_aces_one_card:
+                split_ace = split_hand & (first == 11)
+                actions = np.where(split_ace & (actions != SPLIT), STAND, actions)
+
+            hands.active[rows[actions == STAND], slot] = False
+
+            # Lapkérés és duplázás: egy lap, duplázás után megállás
+            drawing = (actions == HIT) | (actions == DOUBLE)
+            draw_rows = rows[drawing]
+            if draw_rows.size:
+                doubled = actions[drawing] == DOUBLE
+                hands.bets[draw_rows[doubled], slot] *= 2
+                hands.add(draw_rows, slot, self.draw(draw_rows))
+                totals, _ = hands.totals(draw_rows, slot)
+                hands.active[draw_rows, slot] = ~doubled & (totals <= 21)
+
+            split_rows = rows[actions == SPLIT]
+            if split_rows.size:
+                self.split(hands, split_rows, slot)
+
+    def split(self, hands, rows, slot):
+        while (hands.hands[rows] >= hands.hard.shape[1]).any():
+            hands.grow()
+
+        new_slots = hands.hands[rows]
+        values = hands.first[rows, slot]
+
+        # A második lap átkerül az új kézbe, azonos téttel
+        hands.reset(rows, slot, values)
+        hands.reset(rows, new_slots, values)
+        hands.bets[rows, new_slots] = hands.bets[rows, slot]
+        hands.active[rows, new_slots] = True
+        hands.hands[rows] += 1
+
+        hands.add(rows, slot, self.draw(rows))
+        hands.add(rows, new_slots, self.draw(rows))
+
+        # Split ászok egy lapot kapnak, ha a szabály így szól; ha ez is ász,
+        # a kéz újrasplitre nyitva marad (resplit_aces, max_split_hands)
+        rules = self.rules
+        if rules.split_aces_one_card:
+            split_aces = values == 11
+            aces = rows[split_aces]
+            can_resplit = rules.resplit_aces & (hands.hands[aces] < rules.max_hands)
+            for slots in (slot, new_slots[split_aces]):
+                hands.active[aces, slots] = can_resplit & hands.pair[aces, slots]
+
+    def run(self, rounds, bet=1.0):
+        # Összesítés: körönkénti (asztalonkénti) nettó, négyzetösszeg, eredmények.
+        # Az átlag és az eltérésnégyzet-összeg (m2) körönként páronkénti
+        # összevonással (Chan) halad, a négyzetösszeg kivonása nélkül.
+        net_total = 0.0
+        net_squares = 0.0
+        count = 0
+        mean = 0.0
+        m2 = 0.0
+        outcome_counts = np.zeros(OUTCOME_COUNT, dtype=np.int64)
+
+        for _ in range(rounds):
+            net, outcomes = self.play_round(bet)
+            net_total += net.sum()
+            net_squares += np.square(net).sum()
+            outcome_counts += np.bincount(outcomes[outcomes >= 0], minlength=OUTCOME_COUNT)
+
+            round_mean = net.mean()
+            delta = round_mean - mean
+            total = count + net.size
+            mean += delta * net.size / total
+            m2 += np.square(net - round_mean).sum() + delta * delta * count * net.size / total
+            count = total
+
+        return {
+            'rounds': rounds * self.tables,
+            'net': float(net_total),
+            'net_squares': float(net_squares),
+            'mean': float(mean),
+            'm2': float(m2),
+            'outcomes': outcome_counts.tolist(),
+        }
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Ismételhető mérések a forró pontokra: kézérték, osztás és keverés (a
+# biztonságos keverővel is), teljes körök a motoron át (asztalváltozatonként
+# és folyamatos keverőgéppel is), kötegelt szimuláció és a Qt-s
+# kártyamegjelenítés az automata turbó játékkal együtt (offscreen
+# platformon), valamint a hideg indítás fej nélkül és a GUI-val.
+# Az eredmény JSON, így két futás összevethető.
+#
+#   python benchmarks.py --output bench.json
+#   python benchmarks.py --quick --filter hand
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+from core import CARDS, Card, Deck, Hand, Shoe, make_shoe, make_shuffler
+from engine import RoundEngine, RULE_SETS, SPLIT, DOUBLE
+from strategy import basic_strategy_policy
+
+SEED = 12345
+
+# A --quick futás mintamérete a teljeshez képest
+QUICK_SCALE = 0.1
+
+def measure(function, number, repeat):
+    # A legjobb ismétlés számít, ez a legkevésbé zajos
+    times = timeit.repeat(function, number=number, repeat=repeat)
+    best = min(times)
+    return {
+        'number': number,
+        'repeat': repeat,
+        'best_s': best,
+        'per_call_us': best / number * 1e6,
+        'calls_per_s': number / best if best else None,
+    }
+
+def scaled(count, scale):
+    # Ismétlésszám a skálával (a gyors futásnál törtszám), legalább egy
+    return max(1, int(count * scale))
+
+def make_hand(*values):
+    hand = Hand()
+    for value in values:
+        hand.add_card(Card('spades', value))
+    return hand
+
+def bench_hand_value(scale):
+    # Jellemző kezek: kemény, lágy, pár, sok lapos és besült
+    hands = {
+        'hard_2': make_hand('10', '6'),
+        'soft_2': make_hand('A', '7'),
+        'pair': make_hand('8', '8'),
+        'blackjack': make_hand('A', 'K'),
+        'multi_5': make_hand('2', 'A', '3', 'A', '4'),
+        'busted_3': make_hand('K', '9', '5'),
+    }
+    results = {}
+    for name, hand in hands.items():
+        results[name] = measure(hand.calculate_value, scaled(200000, scale), 5)
+    return results
+
+def bench_dealing(scale):
+    results = {}
+    for name, factory in (('deck', lambda: Deck(random.Random(SEED))),
+                          ('shoe_6', lambda: Shoe(6, 0.75, random.Random(SEED)))):
+        shoe = factory()
+
+        def deal_one(shoe=shoe):
+            shoe.start_round()
+            shoe.deal()
+
+        results[f'{name}_deal'] = measure(deal_one, scaled(100000, scale), 5)
+        results[f'{name}_shuffle'] = measure(shoe.shuffle, scaled(500, scale), 5)
+    return results
+
+def bench_rounds(scale):
+    # Teljes körök alapstratégiával (split és duplázás is előfordul)
+    engine = RoundEngine(Shoe(6, 0.75, random.Random(SEED)), basic_strategy_policy)
+    rounds = scaled(20000, scale)
+
+    splits = doubles = 0
+    def count_actions(hand, upcard):
+        nonlocal splits, doubles
+        action = basic_strategy_policy(hand, upcard)
+        if action == SPLIT and hand.can_split():
+            splits += 1
+        elif action == DOUBLE and hand.can_double():
+            doubles += 1
+        return action
+
+    for _ in engine.play(rounds, 1.0, count_actions):
+        pass
+
+    result = measure(lambda: engine.play_round(1.0), rounds, 3)
+    result['rounds_per_s'] = result.pop('calls_per_s')
+    result['splits_per_round'] = splits / rounds
+    result['doubles_per_round'] = doubles / rounds
+    return {'engine_basic_strategy': result}
+
+def bench_rules(scale):
+    # Ugyanaz a kör minden lefordított asztalváltozattal; a szabályok
+    # ellenőrzése nem lassíthat a klasszikus szabályokhoz képest
+    results = {}
+    for name, rules in RULE_SETS.items():
+        engine = RoundEngine(Shoe(6, 0.75, random.Random(SEED)), basic_strategy_policy, rules)
+        result = measure(lambda: engine.play_round(1.0), scaled(10000, scale), 3)
+        result['rounds_per_s'] = result.pop('calls_per_s')
+        results[name] = result
+    return results
+
+def bench_shufflers(scale):
+    # Cipőkeverés/s és teljes kör/s keverőnként; a biztonságos keverő nem
+    # lassíthatja az asztal forgását a Mersenne Twisterhez képest
+    results = {}
+    for name, factory in (('default', lambda: make_shuffler('default', SEED)),
+                          ('secure', lambda: make_shuffler('secure')),
+                          ('secure_seeded', lambda: make_shuffler('secure', SEED))):
+        deck = Deck(factory())
+        shoe = Shoe(6, 0.75, factory())
+        deck_result = measure(deck.shuffle, scaled(2000, scale), 5)
+        shoe_result = measure(shoe.shuffle, scaled(500, scale), 5)
+        deck_result['shuffles_per_s'] = deck_result.pop('calls_per_s')
+        shoe_result['shuffles_per_s'] = shoe_result.pop('calls_per_s')
+
+        engine = RoundEngine(Shoe(6, 0.75, factory()), basic_strategy_policy)
+        round_result = measure(lambda: engine.play_round(1.0), scaled(10000, scale), 3)
+        round_result['rounds_per_s'] = round_result.pop('calls_per_s')
+
+        results[f'{name}_deck'] = deck_result
+        results[f'{name}_shoe_6'] = shoe_result
+        results[f'{name}_rounds'] = round_result
+
+    results['secure_vs_default_shoe_6'] = (results['secure_shoe_6']['shuffles_per_s'] /
+                                           results['default_shoe_6']['shuffles_per_s'])
+    results['secure_vs_default_rounds'] = (results['secure_rounds']['rounds_per_s'] /
+                                           results['default_rounds']['rounds_per_s'])
+    return results
+
+def bench_csm(scale):
+    # Folyamatos keverőgép: kör/s a munkamenet elején és sok kör után, a
+    # hagyományos cipővel összevetve; a sebesség nem függhet a hossztól
+    results = {}
+    for name, holdback in (('shoe_6', None), ('csm_6', 0), ('csm_6_holdback_20', 20)):
+        engine = RoundEngine(make_shoe(6, 0.75, random.Random(SEED), holdback),
+                             basic_strategy_policy)
+        early = measure(lambda: engine.play_round(1.0), scaled(10000, scale), 3)
+        for _ in range(scaled(100000, scale)):
+            engine.play_round(1.0)
+        late = measure(lambda: engine.play_round(1.0), scaled(10000, scale), 3)
+        early['rounds_per_s'] = early.pop('calls_per_s')
+        late['rounds_per_s'] = late.pop('calls_per_s')
+        results[f'{name}_early'] = early
+        results[f'{name}_late'] = late
+    return results
+
+def bench_batch(scale):
+    try:
+        from batch import BatchSimulator
+    except ImportError:
+        return {'skipped': 'numpy nem elérhető'}
+
+    simulator = BatchSimulator(scaled(20000, scale), decks=6, penetration=0.75, seed=SEED)
+    simulator.play_round()
+    result = measure(simulator.play_round, 5, 3)
+    result['rounds_per_s'] = simulator.tables * 5 / result['best_s']
+    return {'batch_round': result}
+
+def bench_gui(scale):
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    try:
+        from PyQt5.QtWidgets import QApplication
+        import blackjack
+    except ImportError:
+        return {'skipped': 'PyQt5 nem elérhető'}
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    widget = blackjack.HandWidget()
+    dealer = blackjack.HandWidget(is_dealer=True)
+    card = CARDS[10]
+
+    def label_roundtrip():
+        widget.release_label(widget.create_card_label(card))
+
+    # Egy lapkérés megjelenítése: egy új lap a meglévők mellé
+    def hit_update():
+        if len(widget.hand.cards) >= 6:
+            widget.clear()
+        widget.hand.add_card(CARDS[len(widget.hand.cards) * 7])
+        widget.update_display()
+
+    # Osztó: két lap, majd a rejtett lap felfordítása
+    def dealer_round():
+        dealer.clear()
+        dealer.hand.add_card(CARDS[3])
+        dealer.hand.add_card(CARDS[25])
+        dealer.update_display()
+        dealer.update_display(reveal_dealer=True)
+
+    results = {}
+    created_before = blackjack.HandWidget.labels_created
+    results['create_card_label'] = measure(label_roundtrip, scaled(2000, scale), 5)
+    results['update_display_hit'] = measure(hit_update, scaled(2000, scale), 5)
+    results['update_display_dealer_reveal'] = measure(dealer_round, scaled(1000, scale), 5)
+    app.processEvents()
+    results['labels_created'] = blackjack.HandWidget.labels_created - created_before
+    results['pixmap_cache'] = blackjack.pixmap_cache.stats()
+    results['autoplay_turbo'] = bench_autoplay(app, blackjack, scaled(1000, scale))
+    return results
+
+def bench_autoplay(app, blackjack, rounds):
+    # Automata turbó játék a teljes ablakon át, összevont kirajzolással
+    window = blackjack.BlackjackGame()
+    window.show()
+    frames_before = blackjack.repaints.frames
+    autoplay = window.start_autoplay(rounds)
+    autoplay.on_finished = lambda autoplay: app.quit()
+    app.exec_()
+    window.close()
+    return {
+        'rounds': autoplay.played,
+        'rounds_per_s': autoplay.rate(),
+        'frames': blackjack.repaints.frames - frames_before,
+    }
+
+def run_process(args, env=None):
+    started = time.perf_counter()
+    subprocess.run([sys.executable] + args, check=True, env=env,
+                   cwd=os.path.dirname(os.path.abspath(__file__)),
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - started
+
+def bench_startup(scale):
+    # Hideg indítás külön folyamatokban: a legjobb falióra-idő számít
+    repeat = scaled(3, scale)
+    headless = {
+        'python_only': ['-c', 'pass'],
+        'import_core': ['-c', 'import core'],
+        'import_blackjack': ['-c', 'import sys, blackjack; blackjack.Deck(); '
+                                   'assert "PyQt5" not in sys.modules'],
+        'import_engine_strategy': ['-c', 'import engine, strategy'],
+    }
+    results = {}
+    for name, args in headless.items():
+        results[name] = {'best_s': min(run_process(args) for _ in range(repeat))}
+
+    try:
+        import PyQt5
+    except ImportError:
+        results['gui'] = {'skipped': 'PyQt5 nem elérhető'}
+        return results
+
+    # A GUI saját jelentése: core import, Qt import, ablak, első kirajzolás, kártyaképek
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get('QT_QPA_PLATFORM', 'offscreen'))
+    best = None
+    with tempfile.TemporaryDirectory() as directory:
+        report_path = os.path.join(directory, 'startup.json')
+        for _ in range(repeat):
+            wall = run_process(['blackjack.py', f'--startup-report={report_path}',
+                                '--exit-after-startup'], env)
+            with open(report_path, encoding='utf-8') as report:
+                marks = json.load(report)
+            if best is None or wall < best['best_s']:
+                best = {'best_s': wall, 'marks_ms': marks}
+    results['gui'] = best
+    return results
+
+BENCHMARKS = (
+    ('hand_value', bench_hand_value),
+    ('dealing', bench_dealing),
+    ('rounds', bench_rounds),
+    ('rules', bench_rules),
+    ('shufflers', bench_shufflers),
+    ('csm', bench_csm),
+    ('batch', bench_batch),
+    ('gui', bench_gui),
+    ('startup', bench_startup),
+)
+
+def run_benchmarks(scale=1, name_filter=None):
+    report = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'system': platform.system(),
+        'scale': scale,
+        'results': {},
+    }
+    for name, benchmark in BENCHMARKS:
+        if name_filter and name_filter not in name:
+            continue
+        # Azonos seed minden futásnál, hogy a lapsorrend is azonos legyen
+        random.seed(SEED)
+        started = time.perf_counter()
+        report['results'][name] = benchmark(scale)
+        report['results'][name]['elapsed_s'] = time.perf_counter() - started
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Blackjack teljesítménymérések")
+    parser.add_argument('--output', help="JSON kimeneti fájl (alapértelmezés: stdout)")
+    parser.add_argument('--quick', action='store_true',
+                        help=f"Rövidebb futás (skála: {QUICK_SCALE})")
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help="A minták méretének szorzója (tört is lehet)")
+    parser.add_argument('--filter', help="Csak a nevében ezt tartalmazó mérések")
+    args = parser.parse_args()
+
+    report = run_benchmarks(QUICK_SCALE if args.quick else args.scale, args.filter)
+    if args.quick:
+        report['quick'] = True
+
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            output.write(text + "\n")
+    else:
+        print(text)
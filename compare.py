@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Párosított összehasonlítás közös véletlen számokkal: két jelölt (stratégia
+# és/vagy asztalváltozat) ugyanazokból a kevert cipőkből játszik, körről
+# körre ugyanazokkal a kezdőlapokkal. Az eredmény a körönkénti nettók
+# különbségének átlaga és standard hibája; mivel a két jelölt ugyanazt a
+# szerencsét kapja, a különbség szórása töredéke a független futásokénak.
+#
+# A lapfolyamok akkor is igazítva maradnak, ha a jelöltek eltérő számú
+# lapot húznak: mindkettő a kör elejéről indul, a kör után pedig onnan
+# folytatja, ameddig a többet húzó eljutott (a másik fölösleges lapjai
+# égetett lapként kimaradnak). Keveréskor mindkettő ugyanazt a sorrendet
+# kapja; antithetic=True esetén minden második cipő az előző fordítottja.
+#
+#   python compare.py --first basic --second dealer --rounds 100000
+#   python compare.py --first basic:classic --second basic:vegas_h17 --precision 0.001
+#   python compare.py --first basic --second deviations --antithetic --time-budget 60
+
+import argparse
+import math
+import random
+import time
+from array import array
+
+from core import Shoe
+from engine import RoundEngine, RULE_SETS, dealer_style_policy, get_rules
+from simulation import SimulationStats, STOP_REASONS
+from strategy import basic_strategy_policy, load_strategy, StrategyPolicy
+
+class CommonShoes:
+    # A két jelölt közös lapsorrendjei: a g-edik keverés sorrendje
+    # mindkettőnél ugyanaz, és csak egyszer készül el
+    def __init__(self, decks=6, penetration=0.75, rng=None, antithetic=False):
+        self.decks = decks
+        self.penetration = penetration
+        self.rng = rng if rng is not None else random
+        self.antithetic = antithetic
+        self.orders = {}
+
+    def order(self, generation):
+        order = self.orders.get(generation)
+        if order is None:
+            if self.antithetic and generation % 2:
+                # Ellentétes pár: azonos összetétel, fordított sorrend
+                order = self.order(generation - 1)[::-1]
+            else:
+                order = array('B', range(52)) * self.decks
+                self.rng.shuffle(order)
+            self.orders[generation] = order
+        return order
+
+    def release(self, generation):
+        # A már nem használt sorrendek eldobása (az előzőt az ellentétes
+        # pár miatt megtartjuk)
+        for old in [old for old in self.orders if old < generation - 1]:
+            del self.orders[old]
+
+class AlignedShoe(Shoe):
+    # Egy jelölt nézete a közös cipőre: saját pozíció és számolás, a
+    # lapsorrendet a CommonShoes adja, helyben sosem kever
+    def __init__(self, source):
+        self.source = source
+        self.generation = -1
+        super().__init__(source.decks, source.penetration, source.rng)
+
+    def shuffle_buffer(self):
+        self.generation += 1
+        self.buffer = self.source.order(self.generation)
+
+    def sync(self, other):
+        # Átállás a másik nézet állapotára (kör végi igazítás)
+        self.generation = other.generation
+        self.buffer = other.buffer
+        self.position = other.position
+        self.counts[:] = other.counts
+        self.running_count = other.running_count
+
+class PairedComparison:
+    # first, second: (policy, szabálykészlet) párok
+    def __init__(self, first, second, decks=6, penetration=0.75, seed=None, antithetic=False):
+        self.source = CommonShoes(decks, penetration, random.Random(seed), antithetic)
+        self.shoes = (AlignedShoe(self.source), AlignedShoe(self.source))
+        self.engines = tuple(RoundEngine(shoe, policy, rules)
+                             for shoe, (policy, rules) in zip(self.shoes, (first, second)))
+        self.stats = (SimulationStats(), SimulationStats())
+        self.difference = SimulationStats()  # first - second, körönként
+
+    @property
+    def rounds(self):
+        return self.difference.rounds
+
+    def play_round(self, bet=1):
+        rounds = [engine.play_round(bet) for engine in self.engines]
+
+        # Igazítás: mindkét nézet onnan folytatja, ameddig a többet húzó jutott
+        leader = max(self.shoes, key=lambda shoe: (shoe.generation, shoe.position))
+        for shoe in self.shoes:
+            if shoe is not leader:
+                shoe.sync(leader)
+        self.source.release(leader.generation)
+
+        for stats, game_round in zip(self.stats, rounds):
+            stats.add_round(game_round)
+        self.difference.add(rounds[0].net() - rounds[1].net(), ())
+        return rounds
+
+    def run(self, rounds, bet=1):
+        for _ in range(rounds):
+            self.play_round(bet)
+        return self
+
+    def independent_variance(self):
+        # A különbség szórásnégyzete, ha a két jelölt független cipőkből játszana
+        return self.stats[0].variance() + self.stats[1].variance()
+
+    def independent_error(self):
+        if self.rounds < 2:
+            return math.inf
+        return math.sqrt(self.independent_variance() / self.rounds)
+
+    def variance_reduction(self):
+        # Független futásokhoz képest hányszor kevesebb kör kell ugyanahhoz
+        # a pontossághoz
+        paired = self.difference.variance()
+        return self.independent_variance() / paired if paired else math.inf
+
+    def summary(self, confidence=0.95):
+        difference = self.difference
+        return (f"{self.rounds:,} kör, különbség: {difference.mean():+.5f} "
+                f"± {difference.half_width(confidence):.5f} egység/kör ({confidence:.0%}), "
+                f"szóráscsökkentés: {self.variance_reduction():.1f}x")
+
+def run_paired(comparison, precision=None, time_budget=None, max_rounds=None, bet=1,
+               confidence=0.95, check_every=10000, progress=None):
+    # Szakaszos futás a simulation.run_sequential leállási feltételeivel; a
+    # pontosság itt a különbség konfidencia-félszélessége
+    if precision is None and time_budget is None and max_rounds is None:
+        raise ValueError("Pontosság, időkeret vagy körszám kell a leálláshoz")
+
+    started = time.perf_counter()
+    while True:
+        rounds = check_every
+        if max_rounds is not None:
+            rounds = min(rounds, max_rounds - comparison.rounds)
+        comparison.run(rounds, bet)
+
+        if progress is not None:
+            progress(comparison, time.perf_counter() - started)
+
+        if precision is not None and comparison.difference.half_width(confidence) <= precision:
+            return 'precision'
+        if time_budget is not None and time.perf_counter() - started >= time_budget:
+            return 'time'
+        if max_rounds is not None and comparison.rounds >= max_rounds:
+            return 'rounds'
+
+# Parancssori stratégianevek
+POLICIES = ('basic', 'dealer', 'generated', 'deviations')
+
+def make_policy(name, rules, decks):
+    if name == 'basic':
+        return basic_strategy_policy
+    if name == 'dealer':
+        return dealer_style_policy
+    if name in ('generated', 'deviations'):
+        return StrategyPolicy(load_strategy(rules, decks, deviations=name == 'deviations'))
+    raise ValueError(f"Ismeretlen stratégia: {name} (lehet: {', '.join(POLICIES)})")
+
+def parse_candidate(text, decks):
+    # "stratégia[:változat]", pl. basic:vegas_h17
+    name, _, variant = text.partition(':')
+    if variant and variant not in RULE_SETS:
+        raise ValueError(f"Ismeretlen asztalváltozat: {variant}")
+    rules = get_rules(variant or 'classic')
+    return make_policy(name, rules, decks), rules
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Két stratégia vagy változat párosított összehasonlítása")
+    parser.add_argument('--first', default='basic', help="stratégia[:változat]")
+    parser.add_argument('--second', default='dealer', help="stratégia[:változat]")
+    parser.add_argument('--rounds', type=int,
+                        help="Körszám (alapból 100000; szakaszos futásnál felső korlát)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--bet', type=float, default=1.0)
+    parser.add_argument('--decks', type=int, default=6)
+    parser.add_argument('--penetration', type=float, default=0.75)
+    parser.add_argument('--antithetic', action='store_true',
+                        help="Minden második cipő az előző fordítottja")
+    parser.add_argument('--precision', type=float,
+                        help="Leállás, ha a különbség félszélessége legfeljebb ennyi egység/kör")
+    parser.add_argument('--time-budget', type=float, help="Leállás ennyi másodperc után")
+    parser.add_argument('--confidence', type=float, default=0.95)
+    parser.add_argument('--check-every', type=int, default=10000)
+    args = parser.parse_args()
+
+    try:
+        first = parse_candidate(args.first, args.decks)
+        second = parse_candidate(args.second, args.decks)
+    except ValueError as error:
+        parser.error(str(error))
+
+    comparison = PairedComparison(first, second, args.decks, args.penetration,
+                                  args.seed, args.antithetic)
+    if args.precision is not None or args.time_budget is not None:
+        def report(comparison, elapsed):
+            print(f"[{elapsed:7.1f} mp] {comparison.summary(args.confidence)}", flush=True)
+
+        reason = run_paired(comparison, args.precision, args.time_budget, args.rounds,
+                            args.bet, args.confidence, args.check_every, report)
+        print(f"Leállás: {STOP_REASONS[reason]}")
+    else:
+        comparison.run(args.rounds or 100000, args.bet)
+
+    confidence = args.confidence
+    for label, stats in zip((args.first, args.second), comparison.stats):
+        print(f"{label}: {stats.mean():+.5f} ± {stats.half_width(confidence):.5f} egység/kör")
+    difference = comparison.difference
+    low, high = difference.confidence_interval(confidence)
+    print(f"különbség ({args.first} - {args.second}): {difference.mean():+.5f} egység/kör, "
+          f"{confidence:.0%} intervallum: [{low:+.5f}, {high:+.5f}]")
+    print(f"standard hiba: párosítva {difference.standard_error():.5f}, "
+          f"független futásokkal {comparison.independent_error():.5f}")
+    reduction = comparison.variance_reduction()
+    if math.isinf(reduction):
+        print("szóráscsökkentés: a két jelölt minden körben azonos nettót ért el")
+    else:
+        print(f"szóráscsökkentés: {reduction:.1f}x (független futással kb. "
+              f"{comparison.rounds * reduction:,.0f} kör kellene ugyanehhez)")
@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# A játék Qt-független alaptípusai: kártya, pakli és kéz
+
+import hashlib
+import os
+import random
+from array import array
+from collections import deque
+
+# Lapszínek és értékek; a lap indexe 0-51: szín * 13 + rang
+SUITS = ('hearts', 'diamonds', 'clubs', 'spades')
+VALUES = ('2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A')
+SUIT_INDEX = {suit: i for i, suit in enumerate(SUITS)}
+RANK_INDEX = {value: i for i, value in enumerate(VALUES)}
+ACE = RANK_INDEX['A']
+
+# Előre kiszámolt táblák rangonként: pontérték (ász = 11, később 1-re
+# változhat) és a képfájlnév eleje. A tízes értékű lapok (10, J, Q, K)
+# pontértéke azonos, így split szempontjából egy csoportot alkotnak.
+RANK_POINTS = (2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 11)
+RANK_HI_LO = (1, 1, 1, 1, 1, 0, 0, 0, -1, -1, -1, -1, -1)  # Hi-Lo számolás
+RANK_IMAGE_NAMES = ('2', '3', '4', '5', '6', '7', '8', '9', '10',
+                    'jack', 'queen', 'king', 'ace')
+IMAGE_FILES = tuple(f"cards/{RANK_IMAGE_NAMES[index % 13]}_of_{SUITS[index // 13]}.png"
+                    for index in range(52))
+
+class Card:
+    # Kompakt lap: nincs __dict__, minden adat az indexből származik
+    __slots__ = ('index', 'rank', 'points', 'hi_lo')
+
+    def __init__(self, suit, value):
+        self.rank = RANK_INDEX[value]
+        self.index = SUIT_INDEX[suit.lower()] * 13 + self.rank
+        self.points = RANK_POINTS[self.rank]
+        self.hi_lo = RANK_HI_LO[self.rank]
+
+    @staticmethod
+    def from_index(index):
+        return CARDS[index]
+
+    @property
+    def suit(self):
+        return SUITS[self.index // 13]
+
+    @property
+    def value(self):
+        return VALUES[self.rank]
+
+    def get_numeric_value(self):
+        return self.points
+
+    def get_image_file(self):
+        return IMAGE_FILES[self.index]
+
+    def __str__(self):
+        return f"{self.value} of {self.suit}"
+
+# A lapok megváltoztathatatlanok, ezért a paklik ezt az 52 példányt osztják meg
+CARDS = tuple(Card(SUITS[index // 13], VALUES[index % 13]) for index in range(52))
+
+# Keverők: bármi lehet, aminek van shuffle(sorozat) metódusa (pl.
+# random.Random). A Shoe és a Deck rng paramétere ilyet vár.
+ENTROPY_WORDS = 16384  # Egyszerre előre lekért 32 bites szavak (64 KiB)
+WORD_RANGE = 1 << 32
+WORD_MASK = WORD_RANGE - 1
+
+class SecureShuffler:
+    # Kriptográfiailag biztonságos keverő valódi pénzes játékhoz. Az entrópia
+    # nagy pufferekben jön (os.urandom), nem cserénként; a Fisher–Yates
+    # indexei modulo-torzítás nélküliek (Lemire-féle szorzás elutasítással).
+    # seed megadásakor a puffereket SHAKE-256 számlálós folyam tölti, így a
+    # keverés tesztekhez determinisztikus.
+    def __init__(self, seed=None, buffer_words=ENTROPY_WORDS):
+        self.key = None if seed is None else str(seed).encode()
+        self.buffer_words = buffer_words
+        self.counter = 0
+        self.words = array('I')
+        self.position = 0
+
+    def refill(self, needed=0):
+        # A maradék eldobásával új puffer, legalább needed szóval
+        size = max(self.buffer_words, needed) * 4
+        if self.key is None:
+            data = os.urandom(size)
+        else:
+            block = self.key + b':' + self.counter.to_bytes(8, 'little')
+            data = hashlib.shake_256(block).digest(size)
+            self.counter += 1
+        words = array('I')
+        words.frombytes(data)
+        self.words = words
+        self.position = 0
+
+    def word(self):
+        if self.position >= len(self.words):
+            self.refill()
+        word = self.words[self.position]
+        self.position += 1
+        return word
+
+    def randbelow(self, bound):
+        # Egyenletes egész a [0, bound) tartományból (bound <= 2**32)
+        product = self.word() * bound
+        if product & WORD_MASK < bound:
+            threshold = (WORD_RANGE - bound) % bound
+            while product & WORD_MASK < threshold:
+                product = self.word() * bound
+        return product >> 32
+
+    def randrange(self, stop):
+        # A random.Random-mal azonos hívás (a ContinuousShoe ezt használja)
+        return self.randbelow(stop)
+
+    def shuffle(self, sequence):
+        # Fisher–Yates hátulról; egy cserére egy szó jut, elutasításkor több,
+        # ezért a puffer végét minden olvasás előtt ellenőrizzük
+        length = len(sequence)
+        if self.position + length > len(self.words):
+            self.refill(length)
+        words = self.words
+        position = self.position
+        end = len(words)
+
+        for i in range(length - 1, 0, -1):
+            if position >= end:
+                self.refill(i)
+                words = self.words
+                position = 0
+                end = len(words)
+            bound = i + 1
+            product = words[position] * bound
+            position += 1
+            if product & WORD_MASK < bound:
+                # Ritka eset (valószínűsége < bound / 2**32): elutasító mintavétel
+                threshold = (WORD_RANGE - bound) % bound
+                if product & WORD_MASK < threshold:
+                    self.position = position
+                    while product & WORD_MASK < threshold:
+                        product = self.word() * bound
+                    words = self.words
+                    position = self.position
+                    end = len(words)
+            j = product >> 32
+            sequence[i], sequence[j] = sequence[j], sequence[i]
+
+        self.position = position
+
+SHUFFLERS = ('default', 'secure')
+
+def make_shuffler(name='default', seed=None):
+    # default: Mersenne Twister (random.Random), szimulációkhoz;
+    # secure: SecureShuffler, valódi játékhoz
+    if name == 'default':
+        return random.Random(seed)
+    if name == 'secure':
+        return SecureShuffler(seed)
+    raise ValueError(f"Ismeretlen keverő: {name} (lehet: {', '.join(SHUFFLERS)})")
+
+class Shoe:
+    def __init__(self, decks=6, penetration=0.75, rng=None):
+        # Saját keverő (pl. random.Random(seed) a reprodukálható és
+        # párhuzamosítható szimulációkhoz, vagy SecureShuffler)
+        self.rng = rng if rng is not None else random
+        self.decks = decks
+        self.penetration = penetration
+
+        # Előre lefoglalt lapindex-puffer; a keverés ugyanezt rendezi át
+        self.buffer = array('B', range(52)) * decks
+        self.size = len(self.buffer)
+        self.cut_card = max(1, int(self.size * penetration))
+        self.position = 0
+
+        # Maradék összetétel (2-9, tízesek, ász) és Hi-Lo számolás, minden
+        # osztásnál O(1) frissítéssel; ezt olvassa minden fogyasztó
+        self.counts = [0] * 10
+        self.running_count = 0
+        self.listeners = []
+        self.shuffle()
+
+    def shuffle(self):
+        self.shuffle_buffer()
+        self.position = 0
+        self.round_start = 0
+
+        decks = self.decks
+        self.counts[:] = (4 * decks,) * 8 + (16 * decks, 4 * decks)
+        self.running_count = 0
+
+        # Keverésről None lappal értesítjük a feliratkozókat
+        for listener in self.listeners:
+            listener(self, None)
+
+    def shuffle_buffer(self):
+        # Az új lapsorrend; a leszármazottak máshonnan is vehetik (compare.py)
+        self.rng.shuffle(self.buffer)
+
+    def subscribe(self, listener):
+        # listener(cipő, lap): minden osztás után; keveréskor (és a keverőgép
+        # visszahelyezésekor) lap = None
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self.listeners.remove(listener)
+
+    def needs_shuffle(self):
+        return self.position >= self.cut_card
+
+    def start_round(self, cards_needed=0):
+        # Keverés csak körök között: ha elértük a vágókártyát, vagy ha a
+        # maradék a kör várható lapszámára (cards_needed) sem elég. A kör
+        # lapjai a round_start pozíciótól kezdődnek.
+        position = self.position
+        if position >= self.cut_card or self.size - position < cards_needed:
+            self.shuffle()
+        self.round_start = self.position
+
+    def deal(self):
+        position = self.position
+        if position >= self.size:
+            # Kör közben csak akkor keverünk, ha teljesen kifogyott a cipő
+            self.reshuffle_in_round()
+            position = self.position
+        self.position = position + 1
+
+        card = CARDS[self.buffer[position]]
+        self.counts[card.points - 2] -= 1
+        self.running_count += card.hi_lo
+        if self.listeners:
+            for listener in self.listeners:
+                listener(self, card)
+        return card
+
+    def reshuffle_in_round(self):
+        # Vészkeverés kör közben: az asztalon lévő lapok kimaradnak, és a
+        # sorrend elejére kerülnek, mintha már kiosztottuk volna őket (az új
+        # sorrendből csak ezeket hagyjuk ki, így a többi sorrendje egyenletes)
+        in_play = self.buffer[self.round_start:self.position]
+        self.shuffle_buffer()
+        missing = [0] * 52
+        for index in in_play:
+            missing[index] += 1
+        rest = array('B')
+        for index in self.buffer:
+            if missing[index]:
+                missing[index] -= 1
+            else:
+                rest.append(index)
+        if not rest:
+            raise ValueError("A cipő kifogyott: minden lap az asztalon van")
+        self.buffer = in_play + rest
+        self.position = len(in_play)
+        self.round_start = 0
+
+        decks = self.decks
+        counts = self.counts
+        counts[:] = (4 * decks,) * 8 + (16 * decks, 4 * decks)
+        self.running_count = 0
+        for index in in_play:
+            card = CARDS[index]
+            counts[card.points - 2] -= 1
+            self.running_count += card.hi_lo
+
+        for listener in self.listeners:
+            listener(self, None)
+
+    def discard(self, cards):
+        # Egy lezárt kör lapjai; a hagyományos cipő a következő keverésig
+        # félreteszi őket, a ContinuousShoe visszahelyezi
+        pass
+
+    def cards_remaining(self):
+        return self.size - self.position
+
+    def composition(self):
+        # A probability modul formátuma; a cipőt nem másolja
+        return tuple(self.counts)
+
+    def true_count(self):
+        # Futó számolás a hátralévő paklik számával osztva
+        decks_remaining = (self.size - self.position) / 52
+        if decks_remaining <= 0:
+            return 0.0
+        return self.running_count / decks_remaining
+
+    @property
+    def cards(self):
+        # A még kiosztatlan lapok (másolat, csak megjelenítéshez)
+        return [CARDS[index] for index in self.buffer[self.position:]]
+
+# Az egy paklis játék vágókártyája: körök között keverünk, ha a pakli
+# háromnegyede elfogyott, így egy kör ritkán fut ki a lapokból
+DECK_PENETRATION = 0.75
+
+class Deck(Shoe):
+    # Egy 52 lapos pakli vágókártyával; kör közben csak akkor kever, ha egy
+    # kör kimeríti a maradékot (ekkor az asztalon lévő lapok nélkül)
+    def __init__(self, rng=None):
+        super().__init__(decks=1, penetration=DECK_PENETRATION, rng=rng)
+
+    def create_deck(self):
+        self.shuffle()
+
+class ContinuousShoe(Shoe):
+    # Folyamatos keverőgép (CSM): a lezárt körök lapjai visszakerülnek a
+    # gépbe, teljes újrakeverés nincs. A gépben lévő lapok (buffer)
+    # véletlen sorrendű készlet: osztás a végéről (O(1)), visszahelyezés
+    # hozzáfűzéssel és egy véletlen cserével (O(1), a belülről kifelé haladó
+    # Fisher–Yates lépése, így a sorrend egyenletes marad). A dobott lapok
+    # előbb a holdback pufferbe kerülnek, és csak az ezen felüli legrégebbiek
+    # mennek vissza a gépbe. A position a gépen kívüli (játékban lévő és
+    # visszatartott) lapok száma, így a számolás és a true_count változatlan.
+    def __init__(self, decks=6, holdback=0, rng=None):
+        if not 0 <= holdback < decks * 52:
+            raise ValueError(f"A visszatartott lapok száma 0 és {decks * 52 - 1} között lehet")
+        self.holdback = holdback
+        self.held = deque()
+        self.in_play = array('B')  # Az aktuális kör kiosztott lapjai
+        super().__init__(decks, penetration=1.0, rng=rng)
+        self.cut_card = self.size + 1  # Körök között sosem kever
+
+    def shuffle_buffer(self):
+        # Teljes feltöltés induláskor
+        self.buffer = array('B', range(52)) * self.decks
+        self.rng.shuffle(self.buffer)
+        self.held.clear()
+
+    def start_round(self, cards_needed=0):
+        # Új kör: az előző kör lapjai már visszakerültek vagy elvesztek
+        del self.in_play[:]
+
+    def reload(self):
+        # Ha a gép a visszatartott lapok nélkül is üres (pl. félbehagyott
+        # körök lapjai nem jöttek vissza), újratöltés az asztalon lévő lapok
+        # kivételével, hogy egy lap se szerepelhessen kétszer a körben
+        buffer = array('B', range(52)) * self.decks
+        for index in self.in_play:
+            buffer.remove(index)
+        if not buffer:
+            raise ValueError("A keverőgép kiürült: minden lap az asztalon van")
+        self.rng.shuffle(buffer)
+        self.buffer = buffer
+        self.held.clear()
+
+        decks = self.decks
+        counts = self.counts
+        counts[:] = (4 * decks,) * 8 + (16 * decks, 4 * decks)
+        self.running_count = 0
+        for index in self.in_play:
+            card = CARDS[index]
+            counts[card.points - 2] -= 1
+            self.running_count += card.hi_lo
+        self.position = len(self.in_play)
+
+        for listener in self.listeners:
+            listener(self, None)
+
+    def deal(self):
+        buffer = self.buffer
+        if not buffer:
+            # A visszatartott lapok azonnal visszamennek; ha így is üres,
+            # újratöltés a kör lapjai nélkül
+            self.release(len(self.held))
+            if not buffer:
+                self.reload()
+                buffer = self.buffer
+        self.position += 1
+
+        index = buffer.pop()
+        self.in_play.append(index)
+        card = CARDS[index]
+        self.counts[card.points - 2] -= 1
+        self.running_count += card.hi_lo
+        if self.listeners:
+            for listener in self.listeners:
+                listener(self, card)
+        return card
+
+    def discard(self, cards):
+        held = self.held
+        held.extend(card.index for card in cards)
+        overflow = len(held) - self.holdback
+        if overflow > 0:
+            self.release(overflow)
+
+    def release(self, count):
+        # A legrégebben visszatartott count lap vissza a gépbe
+        if not count:
+            return
+        buffer = self.buffer
+        held = self.held
+        counts = self.counts
+        randrange = self.rng.randrange
+        for _ in range(count):
+            index = held.popleft()
+            buffer.append(index)
+            last = len(buffer) - 1
+            other = randrange(last + 1)
+            buffer[last], buffer[other] = buffer[other], index
+
+            card = CARDS[index]
+            counts[card.points - 2] += 1
+            self.running_count -= card.hi_lo
+        self.position -= count
+
+        for listener in self.listeners:
+            listener(self, None)
+
+    @property
+    def cards(self):
+        # A gépben lévő lapok osztási sorrendben (másolat, csak megjelenítéshez)
+        return [CARDS[index] for index in reversed(self.buffer)]
+
+def make_shoe(decks=6, penetration=0.75, rng=None, holdback=None):
+    # holdback: None = hagyományos cipő vágókártyával, egész szám =
+    # folyamatos keverőgép ennyi visszatartott lappal
+    if holdback is None:
+        return Shoe(decks, penetration, rng)
+    return ContinuousShoe(decks, holdback, rng)
+
+class Hand:
+    def __init__(self):
+        self.cards = []
+        self.is_active = True
+        self.doubled = False
+        self.is_split = False     # Split után keletkezett kéz (DAS, split 21)
+        self.split_ace = False    # Split ász egy lappal: csak újrasplit vagy megállás
+        self.surrendered = False
+        self.bet = 0
+
+        # Futó összesítések, hogy az értékek lekérdezése O(1) legyen
+        self.hard_value = 0  # Az ászok itt 1-ként számítanak
+        self.aces = 0
+        self.pair = False
+
+    def add_card(self, card):
+        cards = self.cards
+        cards.append(card)
+
+        if card.rank == ACE:
+            self.hard_value += 1
+            self.aces += 1
+        else:
+            self.hard_value += card.points
+
+        # Két azonos értékű lap esetén lehet osztani (a tízesek egy csoport)
+        self.pair = len(cards) == 2 and cards[0].points == card.points
+
+    def pop_card(self):
+        # Az utolsó lap kivétele split-hez, az összesítések frissítésével
+        card = self.cards.pop()
+
+        if card.rank == ACE:
+            self.hard_value -= 1
+            self.aces -= 1
+        else:
+            self.hard_value -= card.points
+        self.pair = False
+
+        return card
+
+    def calculate_value(self):
+        # Egy ász 11-ként számít, ha így sem lépjük túl a 21-et
+        value = self.hard_value
+        if self.aces and value <= 11:
+            value += 10
+        return value
+
+    def is_soft(self):
+        # Lágy a kéz, ha egy ász még 11-ként számít
+        return self.aces > 0 and self.hard_value <= 11
+
+    def is_busted(self):
+        return self.hard_value > 21
+
+    def is_blackjack(self):
+        return len(self.cards) == 2 and self.calculate_value() == 21
+
+    def can_split(self):
+        return self.pair
+
+    def can_double(self):
+        # Az alapszabályok szerint (a változatokat az engine.RuleSet kezeli):
+        # csak akkor lehet duplázni, ha 2 lap van és az érték 9, 10 vagy 11
+        return len(self.cards) == 2 and 9 <= self.calculate_value() <= 11
@@ -0,0 +1,620 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Qt-független körmotor: egy kör teljes szabálylogikája (osztás, lapkérés,
+# megállás, duplázás, split, feladás, osztó húzása, elszámolás) és az
+# asztalváltozatok szabálykészletei. A GUI és a szimulációk is ezt használják.
+
+from collections import deque
+from functools import partial
+
+from core import ACE, Deck, Hand
+
+# Játékos döntések
+HIT = 0
+STAND = 1
+DOUBLE = 2
+SPLIT = 3
+SURRENDER = 4
+
+# Kézeredmények, a check_winners ágainak sorrendjében
+PLAYER_BUST = 0
+DEALER_BUST = 1
+PLAYER_BLACKJACK = 2
+DEALER_BLACKJACK = 3
+BLACKJACK_PUSH = 4
+PLAYER_HIGHER = 5
+DEALER_HIGHER = 6
+PUSH = 7
+SURRENDERED = 8
+OUTCOME_COUNT = 9
+
+WIN_OUTCOMES = (DEALER_BUST, PLAYER_BLACKJACK, PLAYER_HIGHER)
+PUSH_OUTCOMES = (BLACKJACK_PUSH, PUSH)
+LOSS_OUTCOMES = (PLAYER_BUST, DEALER_BLACKJACK, DEALER_HIGHER, SURRENDERED)
+BLACKJACK_OUTCOMES = (PLAYER_BLACKJACK, BLACKJACK_PUSH)  # A játékosnak blackjackje volt
+
+# A játék saját szabályai; a változatok ettől térnek el. A szótár a
+# generált stratégiák gyorsítótár-kulcsa is.
+CLASSIC_RULES = {
+    'dealer_hits_soft_17': False,
+    'blackjack_payout': 1.5,
+    'double_totals': (9, 10, 11),
+    'double_after_split': True,
+    'split_aces_one_card': True,
+    'split_21_is_blackjack': True,
+    'max_split_hands': 0,  # 0 = korlátlan újrasplit
+    'resplit_aces': True,
+    'surrender': False,    # Feladás az első két lapra (osztói bekukkantás nincs)
+}
+
+RULE_VARIANTS = {
+    'classic': {},
+    'vegas_h17': {'dealer_hits_soft_17': True, 'max_split_hands': 4,
+                  'resplit_aces': False, 'split_21_is_blackjack': False,
+                  'surrender': True},
+    'european': {'double_after_split': False, 'max_split_hands': 2,
+                 'split_21_is_blackjack': False},
+    'six_to_five': {'dealer_hits_soft_17': True, 'blackjack_payout': 1.2,
+                    'double_totals': (10, 11), 'split_21_is_blackjack': False},
+}
+
+# Kikapcsolt körtörténet: a hozzáfűzés C-szintű üres művelet, így a
+# döntéseket rögzítő kód ágak nélkül futhat (mindig üres marad)
+NO_HISTORY = deque(maxlen=0)
+
+# Egy kéz átlagos lapszáma felfelé kerekítve (a többhelyes kör előtti
+# keverési döntéshez)
+TYPICAL_HAND_CARDS = 3
+
+# A keresőtáblák mérete: minden előforduló kézérték belefér
+TOTALS = 32
+
+class RuleSet:
+    # Egy asztalváltozat szabályai egyszer lefordítva keresőtáblákra és
+    # jelzőkre, hogy a forró ciklusokban ne kelljen szabályonként elágazni
+    def __init__(self, rules=None, **overrides):
+        rules = dict(CLASSIC_RULES, **(rules or {}), **overrides)
+        unknown = set(rules) - set(CLASSIC_RULES)
+        if unknown:
+            raise ValueError(f"Ismeretlen szabály: {', '.join(sorted(unknown))}")
+        self.rules = rules
+
+        # Duplázás: double_table[split kéz-e][összeg]
+        allowed = tuple(total in rules['double_totals'] for total in range(TOTALS))
+        after_split = allowed if rules['double_after_split'] else (False,) * TOTALS
+        self.double_table = (allowed, after_split)
+
+        # Az osztó húzása: dealer_hits[lágy-e][összeg]
+        hard = tuple(total < 17 for total in range(TOTALS))
+        soft = tuple(total < 17 or (total == 17 and rules['dealer_hits_soft_17'])
+                     for total in range(TOTALS))
+        self.dealer_hits = (hard, soft)
+
+        # Kifizetési szorzók az eredménykódok sorrendjében (a tétet is tartalmazza)
+        payouts = [0] * OUTCOME_COUNT
+        payouts[DEALER_BUST] = 2
+        payouts[PLAYER_BLACKJACK] = 1 + rules['blackjack_payout']
+        payouts[BLACKJACK_PUSH] = 1
+        payouts[PLAYER_HIGHER] = 2
+        payouts[PUSH] = 1
+        payouts[SURRENDERED] = 0.5
+        self.payouts = tuple(payouts)
+
+        self.max_hands = rules['max_split_hands'] or 1 << 30
+        self.resplit_aces = rules['resplit_aces']
+        self.split_aces_one_card = rules['split_aces_one_card']
+        self.split_blackjack = rules['split_21_is_blackjack']
+        self.surrender = rules['surrender']
+
+    def can_hit(self, hand):
+        # Egylapos split ászra nem jár több lap (újrasplit vagy megállás)
+        return not hand.split_ace
+
+    def can_double(self, hand):
+        return (len(hand.cards) == 2 and not hand.split_ace and
+                self.double_table[hand.is_split][hand.calculate_value()])
+
+    def can_split(self, hand, hand_count):
+        return (hand.pair and hand_count < self.max_hands and
+                (self.resplit_aces or not hand.is_split or hand.cards[0].rank != ACE))
+
+    def can_surrender(self, hand, hand_count):
+        return self.surrender and hand_count == 1 and len(hand.cards) == 2
+
+    def dealer_needs_card(self, dealer_hand):
+        # A lágy összeg közvetlenül a kéz futó összesítéseiből (is_soft és
+        # calculate_value hívása nélkül, az osztó húzása forró ciklus)
+        value = dealer_hand.hard_value
+        if dealer_hand.aces and value <= 11:
+            return self.dealer_hits[1][value + 10]
+        return self.dealer_hits[0][value]
+
+# Lefordított változatok névvel (a CLI-k és a workerek ezt használják)
+RULE_SETS = {name: RuleSet(overrides) for name, overrides in RULE_VARIANTS.items()}
+DEFAULT_RULES = RULE_SETS['classic']
+
+def get_rules(rules):
+    # Név, szabályszótár, RuleSet vagy None (alapszabályok) -> RuleSet
+    if rules is None:
+        return DEFAULT_RULES
+    if isinstance(rules, RuleSet):
+        return rules
+    if isinstance(rules, str):
+        return RULE_SETS[rules]
+    return RuleSet(rules)
+
+def settle_hands(hands, dealer_hand, rules=None):
+    # Egyetlen menet az összes kézen; az osztó kezét csak egyszer értékeljük
+    if rules is None:
+        rules = DEFAULT_RULES
+    payouts_table = rules.payouts
+    split_blackjack = rules.split_blackjack
+
+    dealer_value = dealer_hand.calculate_value()
+    dealer_blackjack = dealer_value == 21 and len(dealer_hand.cards) == 2
+    dealer_busted = dealer_value > 21
+
+    outcomes = []
+    payouts = []
+
+    for hand in hands:
+        hand_value = hand.calculate_value()
+
+        if hand.surrendered:
+            outcome = SURRENDERED
+        elif hand_value > 21:
+            outcome = PLAYER_BUST
+        elif dealer_busted:
+            outcome = DEALER_BUST
+        else:
+            # Split utáni két lapos 21 csak akkor blackjack, ha a szabály engedi
+            hand_blackjack = (hand_value == 21 and len(hand.cards) == 2 and
+                              (split_blackjack or not hand.is_split))
+            if hand_blackjack and not dealer_blackjack:
+                outcome = PLAYER_BLACKJACK
+            elif dealer_blackjack and not hand_blackjack:
+                outcome = DEALER_BLACKJACK
+            elif hand_blackjack and dealer_blackjack:
+                outcome = BLACKJACK_PUSH
+            elif hand_value > dealer_value:
+                outcome = PLAYER_HIGHER
+            elif dealer_value > hand_value:
+                outcome = DEALER_HIGHER
+            else:
+                outcome = PUSH
+
+        # A kifizetés a tétet is tartalmazza (0 = elveszett a tét)
+        outcomes.append(outcome)
+        payouts.append(hand.bet * payouts_table[outcome])
+
+    return outcomes, payouts
+
+class Round:
+    def __init__(self, deck, bet=1, rules=None, record=True):
+        self.deck = deck
+        self.rules = rules if isinstance(rules, RuleSet) else get_rules(rules)
+        self.dealer_hand = Hand()
+        hand = Hand()
+        hand.bet = bet
+        self.hands = [hand]  # Több kéz a split miatt
+        self.active_hand_index = 0
+        self.outcomes = None
+        self.payouts = None
+
+        # A kör története: a lapok osztási sorrendben és a játékos döntései
+        # (kéz indexe, döntés) párokként, a napló és a visszajátszás számára.
+        # record=False esetén (napló vagy folyam nélküli szimuláció) nincs
+        # történet, és a húzás közvetlenül a cipő deal-je
+        if record:
+            self.dealt = []
+            self.actions = []
+        else:
+            self.dealt = NO_HISTORY
+            self.actions = NO_HISTORY
+            self.draw = deck.deal
+
+    def draw(self):
+        card = self.deck.deal()
+        self.dealt.append(card)
+        return card
+
+    def deal(self):
+        hand = self.hands[0]
+
+        # Keverés csak körök között, a vágókártya elérése után
+        self.deck.start_round()
+
+        # Kezdő lapok osztása
+        draw = self.draw
+        dealer_hand = self.dealer_hand
+        hand.add_card(draw())
+        dealer_hand.add_card(draw())
+        hand.add_card(draw())
+        dealer_hand.add_card(draw())
+
+        # Blackjack esetén automatikusan megállunk (két lapon ász + tízes)
+        if hand.aces and hand.hard_value == 11:
+            self.finish_hand(0)
+
+    def is_player_done(self):
+        return self.active_hand_index >= len(self.hands)
+
+    def is_hand_playable(self, hand_index):
+        return (hand_index == self.active_hand_index and
+                hand_index < len(self.hands) and
+                self.hands[hand_index].is_active)
+
+    def can_hit(self, hand_index):
+        return self.rules.can_hit(self.hands[hand_index])
+
+    def can_double(self, hand_index):
+        return self.rules.can_double(self.hands[hand_index])
+
+    def can_split(self, hand_index):
+        return self.rules.can_split(self.hands[hand_index], len(self.hands))
+
+    def can_surrender(self, hand_index):
+        return self.rules.can_surrender(self.hands[hand_index], len(self.hands))
+
+    def hit(self, hand_index):
+        if not self.is_hand_playable(hand_index) or self.hands[hand_index].split_ace:
+            return False
+
+        self.actions.append((hand_index, HIT))
+        self.take_card(hand_index)
+        return True
+
+    def take_card(self, hand_index):
+        hand = self.hands[hand_index]
+        hand.add_card(self.draw())
+
+        # Dupla esetén automatikusan megáll, besülésnél a kéz véget ér
+        if hand.doubled or hand.hard_value > 21:
+            self.finish_hand(hand_index)
+
+    def stand(self, hand_index):
+        if not self.is_hand_playable(hand_index):
+            return False
+
+        self.actions.append((hand_index, STAND))
+        self.finish_hand(hand_index)
+        return True
+
+    def finish_hand(self, hand_index):
+        self.hands[hand_index].is_active = False
+        self.move_to_next_hand()
+
+    def double_down(self, hand_index):
+        if not self.is_hand_playable(hand_index):
+            return False
+
+        hand = self.hands[hand_index]
+        if not self.rules.can_double(hand):
+            return False
+
+        # Tét duplázása, egy lap húzása és automatikus megállás
+        self.actions.append((hand_index, DOUBLE))
+        hand.bet *= 2
+        hand.doubled = True
+        self.take_card(hand_index)
+        return True
+
+    def split(self, hand_index):
+        if not self.is_hand_playable(hand_index):
+            return False
+
+        hand = self.hands[hand_index]
+        if not self.rules.can_split(hand, len(self.hands)):
+            return False
+
+        self.actions.append((hand_index, SPLIT))
+
+        # A második lap átkerül egy új kézbe, azonos téttel
+        new_hand = Hand()
+        new_hand.bet = hand.bet
+        new_hand.add_card(hand.pop_card())
+        hand.is_split = True
+        new_hand.is_split = True
+        self.hands.append(new_hand)
+
+        # Kártyák kiosztása mindkét kézhez
+        hand.add_card(self.draw())
+        new_hand.add_card(self.draw())
+
+        # Ha ászokat splitteltünk és a szabály szerint split ászra csak egy
+        # lap jár, a kezek megállnak; ha a kapott lap is ász és az újrasplit
+        # megengedett (resplit_aces, max_split_hands), a kéz nyitva marad,
+        # de csak újra splitelhető vagy megállhat
+        rules = self.rules
+        if rules.split_aces_one_card and hand.cards[0].rank == ACE:
+            for split_hand in (hand, new_hand):
+                split_hand.split_ace = True
+                split_hand.is_active = rules.can_split(split_hand, len(self.hands))
+            if not hand.is_active:
+                self.move_to_next_hand()
+        return True
+
+    def surrender(self, hand_index):
+        if not self.is_hand_playable(hand_index):
+            return False
+
+        # Feladás: a tét fele visszajár, a kéz véget ér
+        if not self.rules.can_surrender(self.hands[hand_index], len(self.hands)):
+            return False
+
+        self.actions.append((hand_index, SURRENDER))
+        self.hands[hand_index].surrendered = True
+        self.finish_hand(hand_index)
+        return True
+
+    def move_to_next_hand(self):
+        # A következő még aktív kézre lépünk (split ászok már nem aktívak)
+        index = self.active_hand_index + 1
+        hands = self.hands
+        while index < len(hands) and not hands[index].is_active:
+            index += 1
+        self.active_hand_index = index
+
+    def all_busted(self):
+        # Besült vagy feladott kezek: ezek ellen az osztónak nem kell húznia
+        for hand in self.hands:
+            if not (hand.is_busted() or hand.surrendered):
+                return False
+        return True
+
+    def dealer_needs_card(self):
+        # Ha minden kéz besült, az osztó nem húz; egyébként a szabály szerint
+        # 17 alatt (H17 változatban lágy 17-en is) húz
+        return not self.all_busted() and self.rules.dealer_needs_card(self.dealer_hand)
+
+    def dealer_draw(self):
+        self.dealer_hand.add_card(self.draw())
+
+    def play_dealer_hand(self):
+        # A játékos kezei már nem változnak, a besülést elég egyszer nézni
+        if self.all_busted():
+            return
+        dealer_needs_card = self.rules.dealer_needs_card
+        dealer_hand = self.dealer_hand
+        while dealer_needs_card(dealer_hand):
+            self.dealer_draw()
+
+    def settle(self):
+        self.outcomes, self.payouts = settle_hands(self.hands, self.dealer_hand, self.rules)
+        self.deck.discard(self.cards_in_play())  # Keverőgépnél a lapok visszamennek
+        return sum(self.payouts)
+
+    def cards_in_play(self):
+        # A kör összes lapja (a történettől függetlenül)
+        for hand in self.hands:
+            yield from hand.cards
+        yield from self.dealer_hand.cards
+
+    def total_bet(self):
+        return sum(hand.bet for hand in self.hands)
+
+    def net(self):
+        # Nettó eredmény az összes feltett téthez képest
+        return sum(self.payouts) - self.total_bet()
+
+class TableRound:
+    # Több hely egy asztalnál, közös osztóval és cipővel. Minden hely egy
+    # saját Round (kezek, split, döntések), amely az asztal osztói kezét
+    # használja; a helyek balról jobbra következnek. Az asztal dealt listája
+    # a teljes osztási sorrend, a helyeké pedig az, amit a hely egyedül
+    # játszva kapott volna (saját lapjai és az osztó lapjai), így minden hely
+    # köre önállóan naplózható és visszajátszható.
+    def __init__(self, deck, bets, rules=None, record=True):
+        self.deck = deck
+        self.rules = rules if isinstance(rules, RuleSet) else get_rules(rules)
+        self.dealer_hand = Hand()
+        self.dealt = [] if record else NO_HISTORY
+        if not record:
+            self.draw = deck.deal
+        self.seats = []
+        for bet in bets:
+            seat = Round(deck, bet, self.rules, record)
+            seat.dealer_hand = self.dealer_hand
+            if record:
+                seat.draw = partial(self.seat_draw, seat)
+            self.seats.append(seat)
+        self.outcomes = None
+        self.payouts = None
+
+    def draw(self):
+        card = self.deck.deal()
+        self.dealt.append(card)
+        return card
+
+    def seat_draw(self, seat):
+        card = self.draw()
+        seat.dealt.append(card)
+        return card
+
+    def draw_shared(self):
+        # Az osztó lapja: minden hely történetébe bekerül
+        card = self.draw()
+        for seat in self.seats:
+            seat.dealt.append(card)
+        return card
+
+    def deal(self):
+        # Több helynél a vágókártya mögött sem biztos, hogy marad elég lap:
+        # keverés már most, ha a maradék egy átlagos körre sem elég
+        self.deck.start_round(TYPICAL_HAND_CARDS * (len(self.seats) + 1))
+
+        # Kaszinó sorrend: egy lap minden helynek, az osztó felfordított
+        # lapja, második lap minden helynek, végül az osztó rejtett lapja
+        seats = self.seats
+        for seat in seats:
+            seat.hands[0].add_card(seat.draw())
+        self.dealer_hand.add_card(self.draw_shared())
+        for seat in seats:
+            seat.hands[0].add_card(seat.draw())
+        self.dealer_hand.add_card(self.draw_shared())
+
+        # Blackjack esetén a hely automatikusan megáll
+        for seat in seats:
+            hand = seat.hands[0]
+            if hand.aces and hand.hard_value == 11:
+                seat.finish_hand(0)
+
+    def active_seat(self):
+        # Az első hely, amely még nem fejezte be a játékot
+        index = 0
+        seats = self.seats
+        while index < len(seats) and seats[index].is_player_done():
+            index += 1
+        return index
+
+    def is_player_done(self):
+        return self.active_seat() >= len(self.seats)
+
+    def seat_action(self, method, seat_index, hand_index):
+        if seat_index != self.active_seat():
+            return False
+        return method(self.seats[seat_index], hand_index)
+
+    def hit(self, seat_index, hand_index):
+        return self.seat_action(Round.hit, seat_index, hand_index)
+
+    def stand(self, seat_index, hand_index):
+        return self.seat_action(Round.stand, seat_index, hand_index)
+
+    def double_down(self, seat_index, hand_index):
+        return self.seat_action(Round.double_down, seat_index, hand_index)
+
+    def split(self, seat_index, hand_index):
+        return self.seat_action(Round.split, seat_index, hand_index)
+
+    def surrender(self, seat_index, hand_index):
+        return self.seat_action(Round.surrender, seat_index, hand_index)
+
+    def all_busted(self):
+        for seat in self.seats:
+            if not seat.all_busted():
+                return False
+        return True
+
+    def dealer_needs_card(self):
+        # Az osztó csak akkor húz, ha legalább egy helynek van élő keze
+        return not self.all_busted() and self.rules.dealer_needs_card(self.dealer_hand)
+
+    def dealer_draw(self):
+        self.dealer_hand.add_card(self.draw_shared())
+
+    def play_dealer_hand(self):
+        if self.all_busted():
+            return
+        dealer_needs_card = self.rules.dealer_needs_card
+        dealer_hand = self.dealer_hand
+        while dealer_needs_card(dealer_hand):
+            self.dealer_draw()
+
+    def settle(self):
+        # Minden hely minden keze egy menetben, egyszeri osztóértékeléssel;
+        # utána a helyek a saját szeletüket kapják
+        seats = self.seats
+        hands = [hand for seat in seats for hand in seat.hands]
+        outcomes, payouts = settle_hands(hands, self.dealer_hand, self.rules)
+
+        start = 0
+        for seat in seats:
+            end = start + len(seat.hands)
+            seat.outcomes = outcomes[start:end]
+            seat.payouts = payouts[start:end]
+            start = end
+
+        self.outcomes = outcomes
+        self.payouts = payouts
+        self.deck.discard(self.cards_in_play())
+        return sum(payouts)
+
+    def cards_in_play(self):
+        for seat in self.seats:
+            for hand in seat.hands:
+                yield from hand.cards
+        yield from self.dealer_hand.cards
+
+    def total_bet(self):
+        return sum(seat.total_bet() for seat in self.seats)
+
+    def net(self):
+        return sum(self.payouts) - self.total_bet()
+
+def dealer_style_policy(hand, upcard):
+    # Egyszerű stratégia: az osztóhoz hasonlóan 17 alatt lapot kér
+    return HIT if hand.calculate_value() < 17 else STAND
+
+class RoundEngine:
+    # record=True: a körök a lapokat és a döntéseket is megőrzik (napló,
+    # folyam); nélküle a kör csak az elszámoláshoz szükséges állapotot tartja
+    def __init__(self, deck=None, policy=dealer_style_policy, rules=None, record=False):
+        self.deck = deck if deck is not None else Deck()
+        self.policy = policy
+        self.rules = get_rules(rules)
+        self.record = record
+
+    def play_round(self, bet=1, policy=None):
+        if policy is None:
+            policy = self.policy
+
+        # A tét lehet függvény is, amely a cipő állapotából dönt (pl. számolás);
+        # ehhez a keverésnek a döntés előtt kell megtörténnie
+        deck = self.deck
+        if callable(bet):
+            deck.start_round()
+            bet = bet(deck)
+
+        game_round = Round(deck, bet, self.rules, self.record)
+        game_round.deal()
+        self.play_seat(game_round, game_round.dealer_hand.cards[0], policy)
+
+        game_round.play_dealer_hand()
+        game_round.settle()
+        return game_round
+
+    def play_table_round(self, bets, policy=None):
+        # Egy kör több hellyel; a tétek listája helyenként
+        if policy is None:
+            policy = self.policy
+
+        table_round = TableRound(self.deck, bets, self.rules, self.record)
+        table_round.deal()
+
+        upcard = table_round.dealer_hand.cards[0]
+        for seat in table_round.seats:
+            self.play_seat(seat, upcard, policy)
+
+        table_round.play_dealer_hand()
+        table_round.settle()
+        return table_round
+
+    def play_seat(self, game_round, upcard, policy):
+        # A játékos kezeit sorban a stratégia játssza le; a szabálytalan
+        # duplázás, split vagy feladás sima lapkérésnek (egylapos split ásznál
+        # megállásnak) számít. Minden döntés
+        # a Round metódusain át fut, így a metrics modul mérheti őket.
+        hands = game_round.hands
+        while game_round.active_hand_index < len(hands):
+            index = game_round.active_hand_index
+            action = policy(hands[index], upcard)
+
+            if action == STAND:
+                game_round.stand(index)
+                continue
+            if action == DOUBLE:
+                done = game_round.double_down(index)
+            elif action == SPLIT:
+                done = game_round.split(index)
+            elif action == SURRENDER:
+                done = game_round.surrender(index)
+            else:
+                done = False
+            if not done and not game_round.hit(index):
+                game_round.stand(index)  # Split ász: lap helyett megállás
+
+    def play(self, rounds, bet=1, policy=None):
+        for _ in range(rounds):
+            yield self.play_round(bet, policy)
@@ -0,0 +1,1542 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# A PyQt5 alapú játékablak. Közvetlenül a blackjack.py indítja; más
+# modulok a blackjack modulon át, lustán érik el (a Qt csak ekkor töltődik).
+
+import os
+import time
+from collections import OrderedDict
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
+                             QHBoxLayout, QPushButton, QLabel, QFrame,
+                             QMessageBox, QInputDialog, QDialog, QTabWidget,
+                             QShortcut)
+from PyQt5.QtGui import QPixmap, QImage, QFont, QPalette, QColor, QKeySequence
+from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal
+
+import metrics
+from handlog import HandLogWriter
+from core import Deck, ContinuousShoe, Hand, IMAGE_FILES, SHUFFLERS, make_shuffler
+from engine import (TableRound, RULE_SETS, get_rules, STAND, DOUBLE, SPLIT, SURRENDER,
+                    PLAYER_BUST, DEALER_BUST, PLAYER_BLACKJACK, DEALER_BLACKJACK,
+                    BLACKJACK_PUSH, PLAYER_HIGHER, DEALER_HIGHER, PUSH, SURRENDERED)
+
+# Egy asztalnál legfeljebb ennyi játékoshely lehet
+MAX_SEATS = 7
+
+# Eredményszövegek a motor kézeredményeihez
+OUTCOME_MESSAGES = {
+    PLAYER_BUST: "Vesztettél! Túllépted a 21-et.",
+    DEALER_BUST: "Nyertél! Az osztó túllépte a 21-et.",
+    PLAYER_BLACKJACK: "Nyertél! Blackjack!",
+    DEALER_BLACKJACK: "Vesztettél! Az osztónak Blackjack-je van.",
+    BLACKJACK_PUSH: "Döntetlen! Mindkét félnek Blackjack-je van.",
+    PLAYER_HIGHER: "Nyertél! A lapjaid értéke magasabb.",
+    DEALER_HIGHER: "Vesztettél! Az osztó lapjainak értéke magasabb.",
+    PUSH: "Döntetlen! Ugyanaz az érték.",
+    SURRENDERED: "Feladtad! A tét fele visszajár.",
+}
+
+CARD_WIDTH = 80
+CARD_HEIGHT = 120
+CARD_BACK_FILE = "cards/black_joker.png"  # Joker használata kártya hátlapként
+
+class CardPixmapCache:
+    # Folyamatszintű gyorsítótár a már átméretezett kártyaképekhez,
+    # (fájl, méret, pixelarány) kulccsal, LRU korláttal
+    def __init__(self, max_size=128):
+        self.max_size = max_size
+        self.pixmaps = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path, width=CARD_WIDTH, height=CARD_HEIGHT, ratio=1.0):
+        key = (path, width, height, ratio)
+        if key in self.pixmaps:
+            self.hits += 1
+            self.pixmaps.move_to_end(key)
+            return self.pixmaps[key]
+
+        self.misses += 1
+        return self.store(key)
+
+    def store(self, key):
+        # Hiányzó kép esetén None kerül a tárba, így azt sem keressük újra
+        path, width, height, ratio = key
+        pixmap = None
+        if os.path.exists(path):
+            pixmap = QPixmap(path)
+            pixmap = pixmap.scaled(round(width * ratio), round(height * ratio),
+                                   Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            pixmap.setDevicePixelRatio(ratio)
+        return self.insert(key, pixmap)
+
+    def insert(self, key, pixmap):
+        self.pixmaps[key] = pixmap
+        if len(self.pixmaps) > self.max_size:
+            self.pixmaps.popitem(last=False)
+        return pixmap
+
+    def add_image(self, path, image, ratio=1.0):
+        # Háttérszálon betöltött, már átméretezett kép átvétele (a QPixmap
+        # csak a GUI szálon hozható létre); a már tárolt kulcsot nem írja felül
+        key = (path, CARD_WIDTH, CARD_HEIGHT, ratio)
+        if key in self.pixmaps:
+            return
+        pixmap = None
+        if not image.isNull():
+            pixmap = QPixmap.fromImage(image)
+            pixmap.setDevicePixelRatio(ratio)
+        self.insert(key, pixmap)
+
+    def card(self, card, ratio=1.0):
+        return self.get(card.get_image_file(), ratio=ratio)
+
+    def card_back(self, ratio=1.0):
+        return self.get(CARD_BACK_FILE, ratio=ratio)
+
+    def preload(self, ratio=1.0):
+        # Az összes lap és a hátlap betöltése előre (nem számít hibának)
+        for path in IMAGE_FILES + (CARD_BACK_FILE,):
+            key = (path, CARD_WIDTH, CARD_HEIGHT, ratio)
+            if key not in self.pixmaps:
+                self.store(key)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.pixmaps)}
+
+pixmap_cache = CardPixmapCache()
+
+class RepaintBatcher:
+    # Kijelzés-frissítések összevonása: bekapcsolva (automata játék) a
+    # frissítő hívások csak feljegyződnek, és legfeljebb fps-szer
+    # másodpercenként, a legutolsó paraméterekkel futnak le egyszerre
+    def __init__(self):
+        self.active = False
+        self.flushing = False
+        self.pending = {}  # frissítő metódus -> paraméterek
+        self.interval = 33
+        self.last_flush = 0.0
+        self.frames = 0
+        self.timer = None
+
+    def start(self, fps=30):
+        self.interval = max(1, int(1000 / fps))
+        self.active = True
+
+    def stop(self):
+        self.flush()
+        self.active = False
+
+    def defer(self, callback, *args):
+        # True, ha a hívás a következő képkockára halasztódott
+        if not self.active or self.flushing:
+            return False
+        self.pending[callback] = args
+
+        # A QTimer csak akkor jön létre, amikor már fut a QApplication
+        if self.timer is None:
+            self.timer = QTimer()
+            self.timer.setSingleShot(True)
+            self.timer.timeout.connect(self.flush)
+        if not self.timer.isActive():
+            elapsed = (time.perf_counter() - self.last_flush) * 1000
+            self.timer.start(max(0, int(self.interval - elapsed)))
+        return True
+
+    def cancel(self, owner):
+        # Törlendő widget függő frissítéseinek eldobása
+        for callback in [callback for callback in self.pending
+                         if getattr(callback, '__self__', None) is owner]:
+            del self.pending[callback]
+
+    def flush(self):
+        if self.timer is not None:
+            self.timer.stop()
+        pending = self.pending
+        self.pending = {}
+        self.flushing = True
+        try:
+            for callback, args in pending.items():
+                callback(*args)
+        finally:
+            self.flushing = False
+        self.last_flush = time.perf_counter()
+        self.frames += 1
+
+repaints = RepaintBatcher()
+
+class CardArtLoader(QThread):
+    # A kártyaképek betöltése és átméretezése háttérszálon, QImage-ként;
+    # a gyorsítótárba a GUI szálon kerülnek (loaded jelzés)
+    loaded = pyqtSignal(str, QImage)
+
+    def __init__(self, ratio=1.0, parent=None):
+        super().__init__(parent)
+        self.ratio = ratio
+
+    def run(self):
+        width = round(CARD_WIDTH * self.ratio)
+        height = round(CARD_HEIGHT * self.ratio)
+        for path in IMAGE_FILES + (CARD_BACK_FILE,):
+            image = QImage()
+            if os.path.exists(path):
+                image = QImage(path).scaled(width, height, Qt.KeepAspectRatio,
+                                            Qt.SmoothTransformation)
+            self.loaded.emit(path, image)
+
+class CardLabel(QLabel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumSize(CARD_WIDTH, CARD_HEIGHT)
+        self.setAlignment(Qt.AlignCenter)
+        self.setStyleSheet("background-color: transparent;")
+        self.default_font = self.font()
+
+        # Amit a címke éppen mutat: (lap, felfordítva), vagy None
+        self.face = None
+
+    def show_pixmap(self, pixmap):
+        self.setFont(self.default_font)
+        self.setStyleSheet("background-color: transparent;")
+        self.setPixmap(pixmap)
+
+    def show_text(self, text, style, font=None):
+        self.clear()
+        self.setFont(font if font is not None else self.default_font)
+        self.setText(text)
+        self.setStyleSheet(style)
+
+class HandWidget(QWidget):
+    # Az összes HandWidget által létrehozott kártyacímke (méréshez)
+    labels_created = 0
+
+    def __init__(self, parent=None, is_dealer=False):
+        super().__init__(parent)
+        self.is_dealer = is_dealer
+        self.hand = Hand()
+        self.has_turn = True  # Több helynél csak a soron lévő hely gombjai élnek
+
+        # A motor köre, amelyhez a kéz tartozik, és a kéz indexe benne; a
+        # gombok a kör szabálykészlete szerint élnek
+        self.round = None
+        self.hand_index = 0
+
+        # Megjelenített kártyacímkék és az újrahasznosítható készlet
+        self.card_labels = []
+        self.label_pool = []
+
+        # Layout létrehozása
+        self.layout = QVBoxLayout(self)
+
+        # Kéz címe
+        if self.is_dealer:
+            self.title_label = QLabel("Osztó kártyái:")
+        else:
+            self.title_label = QLabel("Játékos kártyái:")
+        self.title_label.setFont(QFont('Arial', 12, QFont.Bold))
+        self.layout.addWidget(self.title_label)
+
+        # Érték címke
+        self.value_label = QLabel("Érték: 0")
+        self.value_label.setFont(QFont('Arial', 10))
+        self.layout.addWidget(self.value_label)
+
+        # Tét címke (csak játékosnál)
+        if not self.is_dealer:
+            self.bet_label = QLabel("Tét: 0 Ft")
+            self.bet_label.setFont(QFont('Arial', 10))
+            self.layout.addWidget(self.bet_label)
+
+        # Kártyák elrendezése
+        self.cards_layout = QHBoxLayout()
+        self.layout.addLayout(self.cards_layout)
+
+        # Játékos gombok (csak játékosnál)
+        if not self.is_dealer:
+            self.buttons_layout = QHBoxLayout()
+
+            self.hit_button = QPushButton("Kérek lapot")
+            self.hit_button.setFont(QFont('Arial', 10))
+            self.hit_button.setEnabled(False)
+
+            self.stand_button = QPushButton("Megállok")
+            self.stand_button.setFont(QFont('Arial', 10))
+            self.stand_button.setEnabled(False)
+
+            self.double_button = QPushButton("Duplázás")
+            self.double_button.setFont(QFont('Arial', 10))
+            self.double_button.setEnabled(False)
+
+            self.split_button = QPushButton("Split")
+            self.split_button.setFont(QFont('Arial', 10))
+            self.split_button.setEnabled(False)
+
+            self.surrender_button = QPushButton("Feladás")
+            self.surrender_button.setFont(QFont('Arial', 10))
+            self.surrender_button.setEnabled(False)
+
+            self.buttons_layout.addWidget(self.hit_button)
+            self.buttons_layout.addWidget(self.stand_button)
+            self.buttons_layout.addWidget(self.double_button)
+            self.buttons_layout.addWidget(self.split_button)
+            self.buttons_layout.addWidget(self.surrender_button)
+
+            self.layout.addLayout(self.buttons_layout)
+
+    def clear(self):
+        # Kártyacímkék visszatétele a készletbe
+        while self.card_labels:
+            self.release_label(self.card_labels.pop())
+
+        # Kéz újraindítása
+        self.hand = Hand()
+        self.round = None
+
+        # Címkék frissítése
+        self.value_label.setText("Érték: 0")
+        if not self.is_dealer:
+            self.bet_label.setText("Tét: 0 Ft")
+
+            # Gombok letiltása
+            self.hit_button.setEnabled(False)
+            self.stand_button.setEnabled(False)
+            self.double_button.setEnabled(False)
+            self.split_button.setEnabled(False)
+            self.surrender_button.setEnabled(False)
+
+    def update_display(self, reveal_dealer=False):
+        # Automata játékban a frissítés a következő képkockára halasztódik
+        if repaints.defer(self.update_display, reveal_dealer):
+            return
+
+        cards = self.hand.cards
+        labels = self.card_labels
+
+        # A címkék egyeztetése a kéz lapjaival: csak az új vagy megváltozott
+        # lapokat rajzoljuk újra (pl. az osztó felfordított lapját)
+        for i, card in enumerate(cards):
+            # Az osztónál a második kártyát csak akkor mutatjuk, ha reveal_dealer=True
+            face_up = not self.is_dealer or i == 0 or reveal_dealer
+
+            if i < len(labels):
+                card_label = labels[i]
+                if card_label.face == (card, face_up):
+                    continue
+            else:
+                card_label = self.take_label()
+                labels.append(card_label)
+
+            if face_up:
+                self.paint_card(card_label, card)
+            else:
+                self.paint_card_back(card_label)
+            card_label.face = (card, face_up)
+
+        # Fölösleges címkék visszatétele a készletbe
+        while len(labels) > len(cards):
+            self.release_label(labels.pop())
+
+        # Érték frissítése
+        if self.is_dealer and not reveal_dealer and len(self.hand.cards) > 1:
+            # Csak az első lap értékét mutatjuk az osztónál
+            first_card_value = self.hand.cards[0].get_numeric_value()
+            self.value_label.setText(f"Érték: {first_card_value}+?")
+        else:
+            value = self.hand.calculate_value()
+            self.value_label.setText(f"Érték: {value}")
+
+        # Tét frissítése (csak játékosnál)
+        if not self.is_dealer:
+            self.bet_label.setText(f"Tét: {self.hand.bet} Ft")
+
+            # Split és Double gombok frissítése
+            self.update_buttons()
+
+    def update_buttons(self):
+        if not self.is_dealer and self.hand.is_active and self.has_turn:
+            self.hit_button.setEnabled(True)
+            self.stand_button.setEnabled(True)
+
+            # Hit, Double, Split és Feladás gomb csak akkor aktív, ha a kör
+            # szabályai szerint megengedett
+            if self.round is not None:
+                self.hit_button.setEnabled(self.round.can_hit(self.hand_index))
+                self.double_button.setEnabled(self.round.can_double(self.hand_index))
+                self.split_button.setEnabled(self.round.can_split(self.hand_index))
+                self.surrender_button.setEnabled(self.round.can_surrender(self.hand_index))
+            else:
+                self.double_button.setEnabled(self.hand.can_double())
+                self.split_button.setEnabled(self.hand.can_split())
+                self.surrender_button.setEnabled(False)
+        else:
+            self.hit_button.setEnabled(False)
+            self.stand_button.setEnabled(False)
+            self.double_button.setEnabled(False)
+            self.split_button.setEnabled(False)
+            self.surrender_button.setEnabled(False)
+
+    def take_label(self):
+        # Címke a készletből, vagy új, ha a készlet üres
+        if self.label_pool:
+            card_label = self.label_pool.pop()
+        else:
+            card_label = CardLabel()
+            HandWidget.labels_created += 1
+
+        self.cards_layout.addWidget(card_label)
+        card_label.show()
+        return card_label
+
+    def release_label(self, card_label):
+        self.cards_layout.removeWidget(card_label)
+        card_label.hide()
+        card_label.face = None
+        self.label_pool.append(card_label)
+
+    def paint_card(self, card_label, card):
+        # A gyorsítótár None-t ad, ha a kártyakép nem létezik
+        pixmap = pixmap_cache.card(card, self.devicePixelRatioF())
+        if pixmap is not None:
+            card_label.show_pixmap(pixmap)
+        else:
+            # Ha nincs kép, akkor szöveggel jelenítjük meg
+            card_label.show_text(str(card), "background-color: white; color: black; border: 1px solid black;")
+
+    def paint_card_back(self, card_label):
+        # A gyorsítótár None-t ad, ha a kártyahát kép nem létezik
+        pixmap = pixmap_cache.card_back(self.devicePixelRatioF())
+        if pixmap is not None:
+            card_label.show_pixmap(pixmap)
+        else:
+            # Ha nincs kép, akkor egyszerű szöveggel jelenítjük meg
+            card_label.show_text("🂠", "background-color: #0033cc; color: white; border: 1px solid black;",
+                                 QFont('Arial', 30))
+
+    def create_card_label(self, card):
+        card_label = self.take_label()
+        self.paint_card(card_label, card)
+        return card_label
+
+    def create_card_back_label(self):
+        card_label = self.take_label()
+        self.paint_card_back(card_label)
+        return card_label
+
+class Seat:
+    # Egy játékoshely: saját pénz, tét, kezek (split miatt több) és a motor
+    # helyhez tartozó köre
+    def __init__(self):
+        self.money = 1000000
+        self.current_bet = 0
+        self.has_bet = False
+        self.player_hands = []
+        self.hands_tab = None
+        self.label = None
+        self.round = None
+
+class BlackjackGame(QMainWindow):
+    # Az első kirajzolás utáni indulási munka (kártyaképek) végét jelzi
+    startup_finished = pyqtSignal()
+
+    def __init__(self, preload_cards=False, hand_log=None, seats=1, startup=None, rules=None,
+                 shuffler=None, csm_holdback=None):
+        super().__init__()
+
+        # Indulási időmérés (metrics.StartupTimer vagy None)
+        self.startup = startup
+        self.first_painted = False
+        self.preload_cards = preload_cards
+        self.art_loader = None
+
+        # Opcionális bináris leosztásnapló (útvonal)
+        self.hand_log = HandLogWriter(hand_log) if hand_log else None
+
+        # Játék logikai változók (a szabályokat a motor köre kezeli, az
+        # asztalváltozat szabálykészlete szerint)
+        self.rules = get_rules(rules)
+        self.shuffler = shuffler  # Keverő (core.make_shuffler); None = random modul
+        self.csm_holdback = csm_holdback  # Nem None: folyamatos keverőgép
+        self.deck = self.create_deck()
+        self.table_round = None
+        self.dealer_hand = Hand()
+        self.active_hand_index = 0
+        self.game_over = False
+
+        # Játékoshelyek; seat_index a fogadó vagy éppen játszó hely
+        self.seats = [Seat() for _ in range(min(max(seats, 1), MAX_SEATS))]
+        self.seat_index = 0
+        self.playing_seats = []
+        self.dealer_delay = 1000  # Az osztó húzásai közti késleltetés (ms)
+        self.autoplay = None      # Futó automata játék (AutoPlayer)
+
+        # Kártyaképek előtöltése a gyorsítótárba indításkor; egyébként az
+        # első kirajzolás után háttérszálon töltődnek be
+        if preload_cards:
+            pixmap_cache.preload(self.devicePixelRatioF())
+
+        # UI beállítása
+        self.init_ui()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.first_painted:
+            self.first_painted = True
+            # A többi indulási munka az eseményhurokból, az ablak megjelenése után
+            QTimer.singleShot(0, self.after_first_paint)
+
+    def after_first_paint(self):
+        if self.startup is not None:
+            self.startup.mark('first_paint')
+
+        # Ellenőrizzük, hogy a kártyák képei elérhetők-e
+        self.check_card_images()
+
+        if self.preload_cards:
+            self.on_card_art_finished()
+            return
+        self.art_loader = CardArtLoader(self.devicePixelRatioF(), self)
+        self.art_loader.loaded.connect(self.on_card_art_loaded)
+        self.art_loader.finished.connect(self.on_card_art_finished)
+        self.art_loader.start()
+
+    def on_card_art_loaded(self, path, image):
+        pixmap_cache.add_image(path, image, self.art_loader.ratio)
+
+    def on_card_art_finished(self):
+        if self.startup is not None:
+            self.startup.mark('card_art')
+        self.startup_finished.emit()
+
+    # Az aktuális hely adatai; egy helynél ugyanaz, mint korábban
+    @property
+    def seat(self):
+        return self.seats[self.seat_index]
+
+    @property
+    def round(self):
+        return self.seat.round
+
+    @property
+    def player_money(self):
+        return self.seat.money
+
+    @player_money.setter
+    def player_money(self, value):
+        self.seat.money = value
+
+    @property
+    def current_bet(self):
+        return self.seat.current_bet
+
+    @current_bet.setter
+    def current_bet(self, value):
+        self.seat.current_bet = value
+
+    @property
+    def player_hands(self):
+        return self.seat.player_hands
+
+    @property
+    def hands_tab(self):
+        return self.seat.hands_tab
+
+    def check_card_images(self):
+        cards_dir = "cards"
+        if not os.path.exists(cards_dir):
+            os.makedirs(cards_dir)
+            QMessageBox.warning(self, "Figyelmeztetés",
+                               "A kártyaképek mappája hiányzik. Kérlek, töltsd le és helyezd a 'cards' mappába a megfelelő képeket!")
+
+    def create_new_hand(self, hand=None):
+        # Új kéztartó widget létrehozása
+        hand_widget = HandWidget()
+
+        # A motor kezének megjelenítése, vagy aktuális fogadás beállítása
+        if hand is not None:
+            hand_widget.hand = hand
+            hand_widget.round = self.round
+        else:
+            hand_widget.hand.bet = self.current_bet
+
+        # Kezek listájához adás (FONTOS: ez legyen előbb!)
+        self.player_hands.append(hand_widget)
+
+        # Az aktuális kéz indexének meghatározása
+        hand_index = len(self.player_hands) - 1
+        hand_widget.hand_index = hand_index
+
+        # Gomb események beállítása (a hely indexével együtt)
+        seat = self.seat_index
+        hand_widget.hit_button.clicked.connect(lambda checked=False, idx=hand_index, seat=seat: self.hit(idx, seat))
+        hand_widget.stand_button.clicked.connect(lambda checked=False, idx=hand_index, seat=seat: self.stand(idx, seat))
+        hand_widget.double_button.clicked.connect(lambda checked=False, idx=hand_index, seat=seat: self.double_down(idx, seat))
+        hand_widget.split_button.clicked.connect(lambda checked=False, idx=hand_index, seat=seat: self.split(idx, seat))
+        hand_widget.surrender_button.clicked.connect(lambda checked=False, idx=hand_index, seat=seat: self.surrender(idx, seat))
+
+        # Feladás gomb csak olyan asztalon, ahol a szabály engedi
+        hand_widget.surrender_button.setVisible(self.rules.surrender)
+
+        # Tab hozzáadása
+        self.hands_tab.addTab(hand_widget, f"Kéz {hand_index + 1}")
+
+        return hand_widget
+
+    def init_ui(self):
+        # Ablak beállítása
+        self.setWindowTitle("Blackjack")
+        self.setMinimumSize(1000, 700)  # Megnövelt méret
+
+        # Színsémák beállítása
+        self.set_color_scheme()
+
+        # Központi widget
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+
+        # Fő elrendezés
+        main_layout = QVBoxLayout(central_widget)
+
+        # Felső információs panel
+        info_panel = QFrame()
+        info_panel.setFrameShape(QFrame.StyledPanel)
+        info_layout = QHBoxLayout(info_panel)
+
+        # Pénz és tét megjelenítése
+        self.money_label = QLabel(f"Pénz: {self.player_money} Ft")
+        self.money_label.setFont(QFont('Arial', 12, QFont.Bold))
+        self.bet_label = QLabel(f"Tét: {self.current_bet} Ft")
+        self.bet_label.setFont(QFont('Arial', 12, QFont.Bold))
+
+        # Lapszámolás kijelzése (csak a kör végén frissül, hogy a rejtett
+        # lapot ne árulja el)
+        self.count_label = QLabel()
+        self.count_label.setFont(QFont('Arial', 12))
+        self.update_count_label()
+
+        info_layout.addWidget(self.money_label)
+        info_layout.addWidget(self.bet_label)
+        info_layout.addWidget(self.count_label)
+
+        # Automata játék állása (kör/s és összesített eredmény)
+        self.autoplay_label = QLabel()
+        self.autoplay_label.setFont(QFont('Arial', 12))
+        self.autoplay_label.hide()
+        info_layout.addWidget(self.autoplay_label)
+
+        main_layout.addWidget(info_panel)
+
+        # Dealer kártyái
+        dealer_frame = QFrame()
+        dealer_frame.setFrameShape(QFrame.StyledPanel)
+        dealer_layout = QVBoxLayout(dealer_frame)
+
+        self.dealer_widget = HandWidget(is_dealer=True)
+        dealer_layout.addWidget(self.dealer_widget)
+
+        main_layout.addWidget(dealer_frame)
+
+        # Játékos kártyái - helyenként egy TabWidget a split kezekhez
+        seats_layout = QHBoxLayout()
+        for index, seat in enumerate(self.seats):
+            self.seat_index = index
+            seat_layout = QVBoxLayout()
+
+            # Több helynél a hely pénze és tétje a kezek fölött
+            if len(self.seats) > 1:
+                seat.label = QLabel()
+                seat.label.setFont(QFont('Arial', 11, QFont.Bold))
+                seat_layout.addWidget(seat.label)
+
+            seat.hands_tab = QTabWidget()
+            seat.hands_tab.setTabPosition(QTabWidget.South)
+
+            # Fő kéz létrehozása
+            self.create_new_hand()
+
+            seat_layout.addWidget(seat.hands_tab)
+            seats_layout.addLayout(seat_layout)
+        self.seat_index = 0
+        self.update_money_labels()
+
+        main_layout.addLayout(seats_layout)
+
+        # Gombok panel
+        buttons_panel = QFrame()
+        buttons_layout = QHBoxLayout(buttons_panel)
+
+        # Stílusok az olvashatóbb szövegekért
+        button_style = """
+        QPushButton {
+            background-color: #0066cc;
+            color: white;
+            padding: 8px 12px;
+            border-radius: 4px;
+            font-weight: bold;
+        }
+        QPushButton:hover {
+            background-color: #0055aa;
+        }
+        QPushButton:disabled {
+            background-color: #cccccc;
+            color: #666666;
+        }
+        """
+
+        self.bet_button = QPushButton("Tét")
+        self.bet_button.setFont(QFont('Arial', 12))
+        self.bet_button.clicked.connect(self.place_bet)
+
+        self.deal_button = QPushButton("Osztás")
+        self.deal_button.setFont(QFont('Arial', 12))
+        # Lambda, hogy a bekapcsolt mérés burkolója is érvényesüljön
+        self.deal_button.clicked.connect(lambda: self.deal_cards())
+        self.deal_button.setEnabled(False)
+
+        self.new_game_button = QPushButton("Új játék")
+        self.new_game_button.setFont(QFont('Arial', 12))
+        self.new_game_button.clicked.connect(self.new_game)
+
+        self.bet_button.setStyleSheet(button_style)
+        self.deal_button.setStyleSheet(button_style)
+        self.new_game_button.setStyleSheet(button_style)
+
+        self.autoplay_button = QPushButton("Automata")
+        self.autoplay_button.setFont(QFont('Arial', 12))
+        self.autoplay_button.clicked.connect(self.toggle_autoplay)
+        self.autoplay_button.setStyleSheet(button_style)
+
+        buttons_layout.addWidget(self.bet_button)
+        buttons_layout.addWidget(self.deal_button)
+        buttons_layout.addWidget(self.new_game_button)
+        buttons_layout.addWidget(self.autoplay_button)
+
+        main_layout.addWidget(buttons_panel)
+
+        # Eredmény címke
+        self.result_label = QLabel("")
+        self.result_label.setAlignment(Qt.AlignCenter)
+        self.result_label.setFont(QFont('Arial', 14, QFont.Bold))
+        main_layout.addWidget(self.result_label)
+
+        # Státusz sáv
+        self.statusBar().showMessage("Helyezz tétet a játék indításához!")
+
+        # Mérés és profilozás futás közbeni kapcsolása, exportálás
+        QShortcut(QKeySequence("Ctrl+Shift+M"), self, self.toggle_instrumentation)
+        QShortcut(QKeySequence("Ctrl+Shift+P"), self, self.toggle_profiler)
+        QShortcut(QKeySequence("Ctrl+Shift+E"), self, self.export_metrics)
+
+    def toggle_instrumentation(self):
+        if instrumentation.enabled:
+            instrumentation.disable()
+            self.statusBar().showMessage("Mérés kikapcsolva")
+        else:
+            instrumentation.enable(GUI_TARGETS, GUI_ROUND)
+            self.statusBar().showMessage("Mérés bekapcsolva")
+
+    def toggle_profiler(self):
+        if profiler.toggle():
+            self.statusBar().showMessage("Profilozó bekapcsolva")
+        else:
+            self.statusBar().showMessage("Profilozó kikapcsolva")
+
+    def export_metrics(self):
+        instrumentation.metrics.write_json("metrics.json")
+        instrumentation.metrics.write_prometheus("metrics.prom")
+        profiler.write_folded("profile.folded")
+        self.statusBar().showMessage("Mérések exportálva: metrics.json, metrics.prom, profile.folded")
+
+    def set_color_scheme(self):
+        # Zöld alapú téma, kaszinó stílusban
+        palette = QPalette()
+
+        # Zöld háttér a kaszinó asztalhoz
+        palette.setColor(QPalette.Window, QColor(53, 101, 77))
+        palette.setColor(QPalette.WindowText, Qt.white)
+
+        # Világosabb szöveg a jobb olvashatóságért
+        palette.setColor(QPalette.Text, Qt.white)
+        palette.setColor(QPalette.ButtonText, Qt.white)
+
+        # Panel háttérszínek
+        palette.setColor(QPalette.Base, QColor(27, 67, 50))
+
+        self.setPalette(palette)
+
+        # Stílus lap az egész alkalmazáshoz
+        self.setStyleSheet("""
+            QFrame {
+                background-color: #1B4332;
+                border-radius: 8px;
+                border: 1px solid #2D6A4F;
+            }
+
+            QLabel {
+                color: white;
+            }
+
+            QMainWindow {
+                background-color: #355E4D;
+            }
+
+            QTabWidget::pane {
+                border: 1px solid #2D6A4F;
+                background-color: #1B4332;
+                border-radius: 8px;
+            }
+
+            QTabBar::tab {
+                background-color: #2D6A4F;
+                color: white;
+                border-bottom-left-radius: 4px;
+                border-bottom-right-radius: 4px;
+                padding: 6px 12px;
+                margin-right: 2px;
+            }
+
+            QTabBar::tab:selected {
+                background-color: #3B8C6E;
+                font-weight: bold;
+            }
+        """)
+
+    def place_bet(self):
+        if self.player_money <= 0:
+            QMessageBox.warning(self, "Figyelmeztetés", "Elfogyott a pénzed! Új játékot kell kezdened.")
+            return
+
+        # Zseton dialógus megnyitása
+        self.open_chip_dialog()
+
+    def open_chip_dialog(self):
+        # Zseton dialógus létrehozása
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Válassz zsetonokat")
+        dialog.setMinimumWidth(400)
+
+        layout = QVBoxLayout(dialog)
+
+        # Jelenlegi tét és egyenleg mutatása
+        info_label = QLabel(f"Egyenleg: {self.player_money} Ft\nJelenlegi tét: {self.current_bet} Ft")
+        info_label.setAlignment(Qt.AlignCenter)
+        info_label.setFont(QFont('Arial', 12))
+        layout.addWidget(info_label)
+
+        # Zsetonok
+        chips_layout = QHBoxLayout()
+
+        # Különböző értékű zsetonok
+        chip_values = [1000, 5000, 10000, 50000, 100000]
+        chip_colors = ["#1E88E5", "#43A047", "#F9A825", "#D81B60", "#6D4C41"]
+
+        # Zseton gombok
+        for i, (value, color) in enumerate(zip(chip_values, chip_colors)):
+            chip_button = QPushButton(f"{value}")
+            chip_button.setFixedSize(80, 80)
+            chip_button.setFont(QFont('Arial', 10, QFont.Bold))
+            chip_button.setStyleSheet(f"""
+                QPushButton {{
+                    background-color: {color};
+                    color: white;
+                    border-radius: 40px;
+                    border: 3px solid white;
+                }}
+                QPushButton:hover {{
+                    background-color: {color};
+                    border: 3px solid #FFEB3B;
+                }}
+                QPushButton:pressed {{
+                    background-color: {color};
+                    border: 3px solid #FFC107;
+                }}
+            """)
+            chip_button.clicked.connect(lambda checked, v=value: self.add_chip(v, info_label))
+            chips_layout.addWidget(chip_button)
+
+        layout.addLayout(chips_layout)
+
+        # Törlés gomb
+        clear_button = QPushButton("Törlés")
+        clear_button.setStyleSheet("""
+            QPushButton {
+                background-color: #F44336;
+                color: white;
+                padding: 8px;
+                border-radius: 4px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #D32F2F;
+            }
+        """)
+        clear_button.clicked.connect(lambda: self.clear_chips(info_label))
+        layout.addWidget(clear_button)
+
+        # OK és Mégse gombok
+        button_layout = QHBoxLayout()
+        ok_button = QPushButton("OK")
+        ok_button.setStyleSheet("""
+            QPushButton {
+                background-color: #4CAF50;
+                color: white;
+                padding: 8px;
+                border-radius: 4px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #388E3C;
+            }
+        """)
+        ok_button.clicked.connect(dialog.accept)
+
+        cancel_button = QPushButton("Mégse")
+        cancel_button.setStyleSheet("""
+            QPushButton {
+                background-color: #9E9E9E;
+                color: white;
+                padding: 8px;
+                border-radius: 4px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #757575;
+            }
+        """)
+        cancel_button.clicked.connect(dialog.reject)
+
+        button_layout.addWidget(cancel_button)
+        button_layout.addWidget(ok_button)
+        layout.addLayout(button_layout)
+
+        # Zseton ideiglenes értéke a dialógusban
+        self.temp_bet = self.current_bet
+
+        # Dialógus megjelenítése
+        result = dialog.exec_()
+
+        # Ha az OK-ra kattintottak
+        if result == QDialog.Accepted and self.temp_bet > 0:
+            self.set_bet(self.temp_bet)
+
+    def set_bet(self, amount):
+        # Az aktuális hely tétje; utána a következő tét nélküli hely jön
+        seat = self.seat
+        seat.current_bet = amount
+        seat.money -= amount
+        seat.has_bet = True
+        self.deal_button.setEnabled(True)
+
+        next_seat = self.next_betting_seat(self.seat_index)
+        if next_seat is None:
+            self.bet_button.setEnabled(False)
+            self.statusBar().showMessage("Kattints az 'Osztás' gombra a játék kezdéséhez!")
+        else:
+            self.seat_index = next_seat
+            self.statusBar().showMessage(f"{next_seat + 1}. hely: helyezz tétet, vagy kezdd az osztást!")
+        self.update_money_labels()
+
+    def next_betting_seat(self, after):
+        # Az első hely a megadott után, amely még nem tett tétet és van pénze
+        for index in range(after + 1, len(self.seats)):
+            seat = self.seats[index]
+            if not seat.has_bet and seat.money > 0:
+                return index
+        return None
+
+    def add_chip(self, value, info_label):
+        if value <= self.player_money:
+            self.temp_bet += value
+            info_label.setText(f"Egyenleg: {self.player_money} Ft\nJelenlegi tét: {self.temp_bet} Ft")
+
+    def clear_chips(self, info_label):
+        self.temp_bet = 0
+        info_label.setText(f"Egyenleg: {self.player_money} Ft\nJelenlegi tét: {self.temp_bet} Ft")
+
+    def update_count_label(self):
+        if repaints.defer(self.update_count_label):
+            return
+        self.count_label.setText(f"Számolás: {self.deck.running_count:+d} "
+                                 f"(valós: {self.deck.true_count():+.1f})")
+
+    def create_deck(self):
+        # Egy pakli; keverőgépnél a lezárt körök lapjai visszakerülnek bele
+        if self.csm_holdback is None:
+            deck = Deck(self.shuffler)
+        else:
+            deck = ContinuousShoe(1, self.csm_holdback, self.shuffler)
+        deck.subscribe(self.on_shoe_changed)
+        return deck
+
+    def on_shoe_changed(self, shoe, card):
+        # Keveréskor a számolás nullázódik
+        if card is None:
+            self.update_count_label()
+
+    def update_money_labels(self):
+        if repaints.defer(self.update_money_labels):
+            return
+        self.money_label.setText(f"Pénz: {self.player_money} Ft")
+        self.bet_label.setText(f"Tét: {self.current_bet} Ft")
+
+        # Több helynél minden hely saját egyenlege, a soron lévő megjelölve
+        for index, seat in enumerate(self.seats):
+            if seat.label is not None:
+                marker = "▶ " if index == self.seat_index else ""
+                seat.label.setText(f"{marker}{index + 1}. hely: {seat.money} Ft, tét: {seat.current_bet} Ft")
+
+    def deal_cards(self):
+        # Új kör indítása a tétet tett helyekkel, közös osztóval
+        self.dealer_widget.clear()
+        self.playing_seats = [index for index, seat in enumerate(self.seats) if seat.has_bet]
+        self.table_round = TableRound(self.deck, [self.seats[index].current_bet
+                                                  for index in self.playing_seats],
+                                      self.rules)
+        self.dealer_hand = self.table_round.dealer_hand
+        self.dealer_widget.hand = self.dealer_hand
+
+        for seat in self.seats:
+            seat.round = None
+        for index, seat_round in zip(self.playing_seats, self.table_round.seats):
+            self.seats[index].round = seat_round
+
+        for seat in self.seats:
+            # Előző kör split kezeinek eltávolítása
+            while len(seat.player_hands) > 1:
+                hand_widget = seat.player_hands.pop()
+                repaints.cancel(hand_widget)
+                hand_widget.deleteLater()
+                seat.hands_tab.removeTab(len(seat.player_hands))
+
+            # Játékos kézhez a motor kezének hozzárendelése
+            current_hand = seat.player_hands[0]
+            if seat.round is None:
+                current_hand.clear()  # Ez a hely kimarad a körből
+            else:
+                current_hand.hand = seat.round.hands[0]
+                current_hand.round = seat.round
+                current_hand.bet_label.setText(f"Tét: {seat.current_bet} Ft")
+
+        # Kezdő lapok osztása kaszinó sorrendben
+        self.table_round.deal()
+
+        # UI frissítése
+        for index in self.playing_seats:
+            seat = self.seats[index]
+            seat.hands_tab.setCurrentIndex(0)
+            seat.player_hands[0].update_display()
+        self.dealer_widget.update_display()
+        self.deal_button.setEnabled(False)
+        self.bet_button.setEnabled(False)
+
+        self.statusBar().showMessage("Kérsz még lapot, vagy megállsz?")
+
+        # Blackjack esetén a motor automatikusan megállt
+        if self.table_round.is_player_done():
+            self.play_dealer_hand()
+        else:
+            self.select_seat(self.playing_seats[self.table_round.active_seat()])
+
+    def select_seat(self, index):
+        # A soron lévő hely kezelése; a többi hely gombjai letiltva
+        self.seat_index = index
+        self.active_hand_index = self.round.active_hand_index
+        for seat_number, seat in enumerate(self.seats):
+            for hand_widget in seat.player_hands:
+                hand_widget.has_turn = seat_number == index
+                hand_widget.update_buttons()
+        self.hands_tab.setCurrentIndex(self.active_hand_index)
+        self.update_money_labels()
+
+    def is_current_seat(self, seat_index):
+        return seat_index is None or seat_index == self.seat_index
+
+    def hit(self, hand_index, seat_index=None):
+        # A motor ellenőrzi, hogy a megfelelő kéz aktív-e
+        if not self.is_current_seat(seat_index) or self.round is None or not self.round.hit(hand_index):
+            return
+
+        self.player_hands[hand_index].update_display()
+        self.move_to_next_hand()
+
+    def stand(self, hand_index, seat_index=None):
+        if not self.is_current_seat(seat_index) or self.round is None or not self.round.stand(hand_index):
+            return
+
+        self.player_hands[hand_index].update_buttons()
+        self.move_to_next_hand()
+
+    def double_down(self, hand_index, seat_index=None):
+        if not self.is_current_seat(seat_index) or self.round is None or not self.round.is_hand_playable(hand_index):
+            return
+
+        current_hand = self.player_hands[hand_index]
+        bet = current_hand.hand.bet
+
+        # Csak akkor duplázhatunk, ha van elég pénz
+        if self.player_money < bet:
+            QMessageBox.warning(self, "Figyelmeztetés", "Nincs elég pénzed a duplázáshoz!")
+            return
+
+        # Tét duplázása, egy lap húzása és automatikus megállás
+        if not self.round.double_down(hand_index):
+            return
+
+        self.player_money -= bet
+        self.update_money_labels()
+        current_hand.update_display()
+        self.move_to_next_hand()
+
+    def split(self, hand_index, seat_index=None):
+        if not self.is_current_seat(seat_index) or self.round is None or not self.round.is_hand_playable(hand_index):
+            return
+
+        current_hand = self.player_hands[hand_index]
+
+        # Ellenőrizzük, hogy lehet-e splittelni
+        if not self.round.can_split(hand_index):
+            return
+
+        # Ellenőrizzük, hogy van-e elég pénz
+        if self.player_money < current_hand.hand.bet:
+            QMessageBox.warning(self, "Figyelmeztetés", "Nincs elég pénzed a split-hez!")
+            return
+
+        self.round.split(hand_index)
+
+        # Új kéz widget a motor új kezéhez
+        new_hand = self.create_new_hand(self.round.hands[-1])
+
+        # Tét levonása a játékos pénzéből
+        self.player_money -= new_hand.hand.bet
+        self.update_money_labels()
+
+        # UI frissítése
+        current_hand.update_display()
+        new_hand.update_display()
+
+        # Split ászok esetén a motor már továbblépett
+        self.move_to_next_hand()
+
+    def surrender(self, hand_index, seat_index=None):
+        # Feladás: a tét felét az elszámolás adja vissza
+        if not self.is_current_seat(seat_index) or self.round is None or not self.round.surrender(hand_index):
+            return
+
+        self.player_hands[hand_index].update_buttons()
+        self.move_to_next_hand()
+
+    def move_to_next_hand(self):
+        # A hely végzett: a következő játszó hely jön, a végén az osztó
+        if self.round.is_player_done():
+            if self.table_round.is_player_done():
+                self.play_dealer_hand()
+            else:
+                self.select_seat(self.playing_seats[self.table_round.active_seat()])
+            return
+
+        # A kijelzés követi a motor aktív kezét
+        if self.round.active_hand_index != self.active_hand_index:
+            self.active_hand_index = self.round.active_hand_index
+            self.hands_tab.setCurrentIndex(self.active_hand_index)
+
+        # Gombok frissítése
+        self.player_hands[self.active_hand_index].update_buttons()
+
+    def play_dealer_hand(self):
+        # Felfedni az osztó második lapját
+        self.dealer_widget.update_display(reveal_dealer=True)
+
+        # Késleltetés nélkül (automata turbó) az osztó egy menetben húz
+        if self.dealer_delay == 0:
+            self.table_round.play_dealer_hand()
+            self.dealer_widget.update_display(reveal_dealer=True)
+            self.check_winners()
+            return
+
+        # Az osztó húz lapokat, amíg a motor szerint kell
+        def dealer_draw():
+            self.table_round.dealer_draw()
+            self.dealer_widget.update_display(reveal_dealer=True)
+
+            if self.table_round.dealer_needs_card():
+                QTimer.singleShot(self.dealer_delay, dealer_draw)  # Késleltetett húzás animációhoz
+            else:
+                self.check_winners()
+
+        if self.table_round.dealer_needs_card():
+            QTimer.singleShot(self.dealer_delay, dealer_draw)
+        else:
+            self.check_winners()
+
+    def check_winners(self):
+        # Elszámolás a motorral: egy menet az összes hely összes kezén
+        self.table_round.settle()
+        if self.hand_log is not None:
+            # A napló formátuma egyhelyes kör: minden hely külön körként
+            # kerül bele, a saját lapjaival és az osztó lapjaival
+            for seat_round in self.table_round.seats:
+                self.hand_log.write_round(seat_round)
+            self.hand_log.flush()
+
+        results = []
+        multi_seat = len(self.seats) > 1
+
+        for index in self.playing_seats:
+            seat = self.seats[index]
+            prefix = f"{index + 1}. hely, " if multi_seat else ""
+            total_win = 0
+
+            for i, (outcome, payout) in enumerate(zip(seat.round.outcomes, seat.round.payouts)):
+                results.append(f"{prefix}Kéz {i+1}: {OUTCOME_MESSAGES[outcome]}")
+                total_win += int(payout)
+
+            # Összes nyeremény hozzáadása
+            seat.money += total_win
+            seat.has_bet = False
+
+        # Eredmények megjelenítése
+        self.show_results("<br>".join(results))
+
+        # A fogadás az első helytől indul újra
+        first_seat = self.next_betting_seat(-1)
+        self.seat_index = first_seat if first_seat is not None else 0
+        self.update_money_labels()
+        self.update_count_label()
+
+        # Gombok frissítése
+        self.bet_button.setEnabled(True)
+        self.deal_button.setEnabled(False)
+
+        # Státusz frissítése
+        self.statusBar().showMessage("Játék vége. Helyezz új tétet vagy kezdj új játékot!")
+
+        # Ha minden helyen elfogyott a pénz
+        if all(seat.money <= 0 for seat in self.seats):
+            QMessageBox.information(self, "Játék vége",
+                                   "Elfogyott a pénzed! Új játékot kell kezdened.")
+            self.bet_button.setEnabled(False)
+
+    def show_results(self, text):
+        if repaints.defer(self.show_results, text):
+            return
+        self.result_label.setText(f"<html>{text}</html>")
+
+    def toggle_autoplay(self):
+        if self.autoplay is not None:
+            self.autoplay.stop()
+            return
+
+        rounds, accepted = QInputDialog.getInt(self, "Automata játék", "Körök száma:",
+                                               1000, 1, 100000000)
+        if accepted:
+            self.start_autoplay(rounds)
+
+    def start_autoplay(self, rounds, delay=0, fps=30, policy=None, bet=None):
+        # A stratégia alapból a tábla szabályaihoz tartozó alapstratégia,
+        # a tét az első hely utolsó tétje (vagy 1000 Ft)
+        if self.autoplay is not None:
+            return self.autoplay
+        if policy is None:
+            from strategy import rules_policy
+            policy = rules_policy(self.rules)
+        if bet is None:
+            bet = self.seats[0].current_bet or 1000
+
+        self.autoplay = AutoPlayer(self, rounds, policy, bet, delay, fps)
+        self.autoplay_button.setText("Leállítás")
+        self.autoplay.start()
+        return self.autoplay
+
+    def new_game(self):
+        if self.autoplay is not None:
+            self.autoplay.stop()
+
+        reply = QMessageBox.question(self, "Új játék",
+                                    "Biztosan új játékot szeretnél kezdeni?",
+                                    QMessageBox.Yes | QMessageBox.No)
+
+        if reply == QMessageBox.Yes:
+            # Kezek törlése és a helyek alaphelyzetbe állítása
+            for index, seat in enumerate(self.seats):
+                while seat.hands_tab.count() > 0:
+                    seat.hands_tab.removeTab(0)
+                seat.player_hands = []
+                seat.round = None
+                seat.current_bet = 0
+                seat.has_bet = False
+
+                # Első kéz létrehozása
+                self.seat_index = index
+                self.create_new_hand()
+            self.seat_index = 0
+
+            # Változók alaphelyzetbe állítása
+            self.deck = self.create_deck()
+            self.table_round = None
+            self.dealer_widget.clear()
+            self.game_over = False
+            self.temp_bet = 0
+            self.active_hand_index = 0
+
+            # UI frissítése
+            self.update_money_labels()
+            self.update_count_label()
+            self.result_label.setText("")
+
+            # Gombok visszaállítása
+            self.bet_button.setEnabled(True)
+            self.deal_button.setEnabled(False)
+
+            self.statusBar().showMessage("Új játék kezdődött! Helyezz tétet a kezdéshez.")
+
+    def closeEvent(self, event):
+        if self.autoplay is not None:
+            self.autoplay.stop()
+        if self.art_loader is not None:
+            self.art_loader.wait()
+        if self.hand_log is not None:
+            self.hand_log.close()
+            self.hand_log = None
+        super().closeEvent(event)
+
+class AutoPlayer:
+    # Automata játék az ablakban: rounds kört játszik a stratégiával a
+    # szokásos ablakmetódusokon (set_bet, deal_cards, hit, ...) át. A
+    # lépések egy képkockányi ideig (1/fps s) egymás után futnak, utána az
+    # eseményhurok jön, így az ablak végig reagál; a kijelzés legfeljebb
+    # fps-szer frissül. delay > 0 esetén lépésenként és osztói lapönként
+    # ennyi ms a szünet (animáció), 0 esetén turbó.
+    def __init__(self, window, rounds, policy, bet=1000, delay=0, fps=30):
+        from simulation import SimulationStats
+
+        self.window = window
+        self.rounds = rounds
+        self.policy = policy
+        self.bet = bet
+        self.delay = delay
+        self.fps = fps
+        self.frame_time = 1.0 / fps
+        self.stats = SimulationStats()  # Helyenkénti körök összesítése
+        self.played = 0
+        self.current = None
+        self.running = False
+        self.started = 0.0
+        self.saved_delay = window.dealer_delay
+        self.on_finished = None
+
+        self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.tick)
+
+    def start(self):
+        window = self.window
+        self.saved_delay = window.dealer_delay
+        window.dealer_delay = self.delay
+        window.autoplay_label.show()
+        repaints.start(self.fps)
+        self.started = time.perf_counter()
+        self.running = True
+        self.timer.start(0)
+
+    def stop(self):
+        if not self.running:
+            return
+        self.running = False
+        self.timer.stop()
+        repaints.stop()
+
+        window = self.window
+        window.dealer_delay = self.saved_delay
+        window.autoplay = None
+        window.autoplay_button.setText("Automata")
+        self.show_progress()
+        window.statusBar().showMessage("Automata játék vége")
+        if self.on_finished is not None:
+            self.on_finished(self)
+
+    def rate(self):
+        elapsed = time.perf_counter() - self.started
+        return self.played / elapsed if elapsed > 0 else 0.0
+
+    def tick(self):
+        # Egy képkockányi játék; utána az eseményhurok fut (rajzolás, bemenet)
+        deadline = time.perf_counter() + self.frame_time
+        while self.running:
+            self.step()
+            if self.delay or time.perf_counter() >= deadline:
+                break
+        if self.running:
+            self.timer.start(self.delay)
+
+    def step(self):
+        window = self.window
+        table_round = window.table_round
+
+        if table_round is None or table_round.outcomes is not None:
+            # Az előző kör összesítése, majd új kör, amíg van hátra és telik a tétre
+            if table_round is not None and table_round is self.current:
+                self.record(table_round)
+            if self.played >= self.rounds or not self.place_bets():
+                self.stop()
+                return
+            window.deal_cards()
+            self.current = window.table_round
+        elif not table_round.is_player_done():
+            self.play_action()
+        # Különben az osztó késleltetve húz; megvárjuk az elszámolást
+
+    def place_bets(self):
+        # Tét minden helyre, amely még nem tett tétet és van pénze
+        window = self.window
+        index = window.next_betting_seat(-1)
+        while index is not None:
+            if window.seats[index].money < self.bet:
+                return False
+            window.seat_index = index
+            window.set_bet(self.bet)
+            index = window.next_betting_seat(index)
+        return any(seat.has_bet for seat in window.seats)
+
+    def play_action(self):
+        window = self.window
+        game_round = window.round
+        index = game_round.active_hand_index
+        hand = game_round.hands[index]
+        action = self.policy(hand, window.dealer_hand.cards[0])
+        covered = window.player_money >= hand.bet
+
+        # Szabálytalan vagy fedezetlen döntés sima lapkérésnek számít
+        if action == STAND:
+            window.stand(index)
+        elif action == DOUBLE and covered and game_round.can_double(index):
+            window.double_down(index)
+        elif action == SPLIT and covered and game_round.can_split(index):
+            window.split(index)
+        elif action == SURRENDER and game_round.can_surrender(index):
+            window.surrender(index)
+        else:
+            window.hit(index)
+
+    def record(self, table_round):
+        for seat_round in table_round.seats:
+            self.stats.add_round(seat_round)
+        self.played += 1
+        self.current = None
+        repaints.defer(self.show_progress)
+
+    def show_progress(self):
+        stats = self.stats
+        self.window.autoplay_label.setText(
+            f"Automata: {self.played}/{self.rounds} kör, {self.rate():,.0f} kör/s, "
+            f"nettó: {stats.net:+,.0f} Ft, nyert/vesztett/döntetlen: "
+            f"{stats.wins}/{stats.losses}/{stats.pushes}")
+
+# A mérhető GUI-metódusok; a kör a lapok kiosztásától az elszámolásig tart
+GUI_TARGETS = {
+    BlackjackGame: ('deal_cards', 'hit', 'stand', 'double_down', 'split', 'surrender',
+                    'play_dealer_hand', 'check_winners'),
+    HandWidget: ('update_display', 'create_card_label', 'create_card_back_label',
+                 'paint_card', 'paint_card_back'),
+}
+GUI_ROUND = ((BlackjackGame, 'deal_cards'), (BlackjackGame, 'check_winners'))
+
+instrumentation = metrics.Instrumentation()
+profiler = metrics.SamplingProfiler()
+
+def main(argv, startup=None):
+    # A blackjack.py belépési pontja; startup: metrics.StartupTimer vagy None
+    try:
+        print("Program indítása...")
+        app = QApplication(argv)
+        if startup is not None:
+            startup.mark('qapplication')
+        print("QApplication létrehozva")
+        if os.environ.get("BLACKJACK_METRICS"):
+            instrumentation.enable(GUI_TARGETS, GUI_ROUND)
+
+        # --seats=N: több játékoshely egy asztalnál (legfeljebb MAX_SEATS);
+        # --rules=NÉV: asztalváltozat (engine.RULE_SETS);
+        # --shuffler=secure: kriptográfiailag biztonságos keverés;
+        # --csm[=N]: folyamatos keverőgép N visszatartott lappal;
+        # --autoplay=N [--autoplay-delay=MS] [--fps=N]: N kör automata játék;
+        # --startup-report[=fájl]: indulási időjelentés JSON-ban
+        seats = 1
+        rules = None
+        shuffler = None
+        csm_holdback = None
+        autoplay_rounds = 0
+        autoplay_delay = 0
+        fps = 30
+        report_path = None
+        for arg in argv[1:]:
+            if arg.startswith("--seats="):
+                seats = int(arg.split("=", 1)[1])
+            elif arg.startswith("--autoplay="):
+                autoplay_rounds = int(arg.split("=", 1)[1])
+            elif arg.startswith("--autoplay-delay="):
+                autoplay_delay = int(arg.split("=", 1)[1])
+            elif arg.startswith("--fps="):
+                fps = int(arg.split("=", 1)[1])
+            elif arg.startswith("--rules="):
+                rules = arg.split("=", 1)[1]
+                if rules not in RULE_SETS:
+                    print(f"Ismeretlen asztalváltozat: {rules} ({', '.join(RULE_SETS)})")
+                    return 2
+            elif arg.startswith("--shuffler="):
+                name = arg.split("=", 1)[1]
+                if name not in SHUFFLERS:
+                    print(f"Ismeretlen keverő: {name} ({', '.join(SHUFFLERS)})")
+                    return 2
+                shuffler = make_shuffler(name)
+            elif arg == "--csm":
+                csm_holdback = 0
+            elif arg.startswith("--csm="):
+                csm_holdback = int(arg.split("=", 1)[1])
+                if not 0 <= csm_holdback < 52:
+                    print(f"A visszatartott lapok száma 0 és 51 között lehet: {csm_holdback}")
+                    return 2
+            elif arg.startswith("--startup-report="):
+                report_path = arg.split("=", 1)[1]
+
+        window = BlackjackGame(preload_cards="--preload-cards" in argv,
+                               hand_log=os.environ.get("BLACKJACK_HANDLOG"),
+                               seats=seats, startup=startup, rules=rules,
+                               shuffler=shuffler, csm_holdback=csm_holdback)
+        if startup is not None:
+            startup.mark('window_built')
+        print("BlackjackGame létrehozva")
+
+        def startup_done():
+            if startup is not None:
+                if report_path:
+                    startup.write_json(report_path)
+                elif "--startup-report" in argv:
+                    print(f"Indulási idők (ms): {startup.as_dict()}")
+            # Hidegindítás méréséhez: kilépés, amint az indulás befejeződött
+            if "--exit-after-startup" in argv:
+                window.close()
+                app.quit()
+            elif autoplay_rounds:
+                autoplay = window.start_autoplay(autoplay_rounds, autoplay_delay, fps)
+                autoplay.on_finished = autoplay_done
+
+        def autoplay_done(autoplay):
+            stats = autoplay.stats
+            print(f"Automata játék: {autoplay.played} kör, {autoplay.rate():,.0f} kör/s, "
+                  f"nettó: {stats.net:+,.0f} Ft, képkockák: {repaints.frames}")
+            if "--exit-after-autoplay" in argv:
+                window.close()
+                app.quit()
+
+        window.startup_finished.connect(startup_done)
+        window.show()
+        print("Ablak megjelenítve")
+        status = app.exec_()
+        print(f"Kártyakép-gyorsítótár: {pixmap_cache.stats()}")
+        return status
+    except Exception as e:
+        print(f"Hiba történt: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Csak hozzáfűzhető bináris leosztásnapló. A fájl szegmensekből áll, minden
+# szegmens egy fejléc és fix szélességű (12 bájtos) rekordok sora, opcionális
+# CRC32 ellenőrzőösszeggel. Egy kör rekordjai:
+#
+#   ROUND  (sorszám)  - a kör kezdete
+#   CARD   (lapindex) - a kiosztott lapok, osztási sorrendben
+#   ACTION (kéz, döntés) - a játékos döntései
+#   BET    (kéz, tét) és PAYOUT (kéz, eredmény, kifizetés) kezenként
+#   END    (kezek száma, nettó)
+#
+# Az író pufferelve, szegmensenként ír; az olvasó mmap-pel, másolás nélkül
+# járja be a szegmenseket.
+#
+#   python handlog.py write naplo.bjl --rounds 1000000
+#   python handlog.py dump naplo.bjl --limit 5
+
+import argparse
+import mmap
+import os
+import random
+import struct
+import time
+import zlib
+
+from core import CARDS, Shoe
+from engine import NO_HISTORY
+
+MAGIC = b'BJHL'
+VERSION = 1
+FLAG_CHECKSUM = 1
+
+# Szegmensfejléc: magic, verzió, jelzők, tartalék, rekordszám, CRC32
+SEGMENT_HEADER = struct.Struct('<4sBBHII')
+# Rekord: típus, kéz, argumentum, érték
+RECORD = struct.Struct('<BBHd')
+
+ROUND = 0
+CARD = 1
+ACTION = 2
+BET = 3
+PAYOUT = 4
+END = 5
+
+class HandLogWriter:
+    def __init__(self, path, segment_records=65536, checksum=True):
+        self.file = open(path, 'ab')
+        self.checksum = checksum
+        self.capacity = segment_records
+        self.buffer = bytearray(segment_records * RECORD.size)
+        self.count = 0
+
+        # Hozzáfűzéskor a sorszámozás a fájlban lévő utolsó kör után folytatódik
+        self.next_round = 0
+        if os.fstat(self.file.fileno()).st_size:
+            with HandLogReader(path, verify=False) as reader:
+                self.next_round = reader.next_round_number()
+
+    def write_round(self, game_round):
+        # Egy lejátszott és elszámolt kör (engine.Round) rekordjai; a kör
+        # történettel kell fusson (RoundEngine(record=True)), különben a
+        # napló lapok és döntések nélküli, visszajátszhatatlan kört kapna
+        if game_round.dealt is NO_HISTORY:
+            raise ValueError("A kör történet nélkül futott (RoundEngine record=True kell)")
+        self.write_fields([card.index for card in game_round.dealt], game_round.actions,
+                          [hand.bet for hand in game_round.hands], game_round.outcomes,
+                          game_round.payouts, game_round.net())
+
+    def write_record(self, record):
+        # Tömör körrekord (LoggedRound, pl. a stream modul folyamából)
+        self.write_fields(record.cards, record.actions, record.bets, record.outcomes,
+                          record.payouts, record.net)
+
+    def write_fields(self, cards, actions, bets, outcomes, payouts, net):
+        needed = 2 + len(cards) + len(actions) + 2 * len(bets)
+        if self.count + needed > self.capacity:
+            self.flush()
+            if needed > self.capacity:
+                self.capacity = needed
+                self.buffer = bytearray(needed * RECORD.size)
+
+        pack = RECORD.pack_into
+        buffer = self.buffer
+        size = RECORD.size
+        offset = self.count * size
+
+        pack(buffer, offset, ROUND, 0, 0, self.next_round)
+        offset += size
+        for card in cards:
+            pack(buffer, offset, CARD, 0, card, 0.0)
+            offset += size
+        for hand_index, action in actions:
+            pack(buffer, offset, ACTION, hand_index, action, 0.0)
+            offset += size
+        for hand_index, (bet, outcome, payout) in enumerate(zip(bets, outcomes, payouts)):
+            pack(buffer, offset, BET, hand_index, 0, bet)
+            pack(buffer, offset + size, PAYOUT, hand_index, outcome, payout)
+            offset += 2 * size
+        pack(buffer, offset, END, 0, len(bets), net)
+        offset += size
+
+        self.count = offset // size
+        self.next_round += 1
+
+    def flush(self):
+        if not self.count:
+            return
+        payload = memoryview(self.buffer)[:self.count * RECORD.size]
+        crc = zlib.crc32(payload) if self.checksum else 0
+        flags = FLAG_CHECKSUM if self.checksum else 0
+        self.file.write(SEGMENT_HEADER.pack(MAGIC, VERSION, flags, 0, self.count, crc))
+        self.file.write(payload)
+        self.file.flush()
+        self.count = 0
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class LoggedRound:
+    __slots__ = ('number', 'cards', 'actions', 'bets', 'outcomes', 'payouts', 'net')
+
+    def __init__(self, number):
+        self.number = number
+        self.cards = []
+        self.actions = []
+        self.bets = []
+        self.outcomes = []
+        self.payouts = []
+        self.net = 0.0
+
+class HandLogReader:
+    def __init__(self, path, verify=True):
+        self.path = path
+        self.verify = verify
+        self.file = open(path, 'rb')
+        size = os.fstat(self.file.fileno()).st_size
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+    def segments(self):
+        # A szegmensek rekordjai memoryview-ként, másolás nélkül
+        if self.map is None:
+            return
+        view = memoryview(self.map)
+        offset = 0
+        while offset < len(view):
+            magic, version, flags, _, count, crc = SEGMENT_HEADER.unpack_from(view, offset)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Hibás szegmensfejléc itt: {offset}")
+            offset += SEGMENT_HEADER.size
+            end = offset + count * RECORD.size
+            if end > len(view):
+                raise ValueError(f"Csonka szegmens itt: {offset}")
+            payload = view[offset:end]
+            if self.verify and flags & FLAG_CHECKSUM and zlib.crc32(payload) != crc:
+                raise ValueError(f"Hibás ellenőrzőösszeg a szegmensben itt: {offset}")
+            yield payload
+            offset = end
+
+    def next_round_number(self):
+        # Az utolsó szegmens utolsó ROUND rekordja utáni sorszám (egy kör
+        # rekordjai mindig egy szegmensbe kerülnek); üres naplónál 0
+        last = None
+        for payload in self.segments():
+            last = payload
+        if last is None:
+            return 0
+        try:
+            for offset in range(len(last) - RECORD.size, -1, -RECORD.size):
+                kind, _, _, value = RECORD.unpack_from(last, offset)
+                if kind == ROUND:
+                    return int(value) + 1
+            return 0
+        finally:
+            last.release()
+
+    def records(self):
+        for payload in self.segments():
+            yield from RECORD.iter_unpack(payload)
+
+    def rounds(self):
+        current = None
+        for kind, hand_index, argument, value in self.records():
+            if kind == ROUND:
+                current = LoggedRound(int(value))
+            elif kind == CARD:
+                current.cards.append(argument)
+            elif kind == ACTION:
+                current.actions.append((hand_index, argument))
+            elif kind == BET:
+                current.bets.append(value)
+            elif kind == PAYOUT:
+                current.outcomes.append(argument)
+                current.payouts.append(value)
+            elif kind == END:
+                current.net = value
+                yield current
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def write_simulated(path, rounds, seed=0, checksum=True):
+    # Fej nélküli motor körei közvetlenül a naplóba
+    from engine import RoundEngine
+    from strategy import basic_strategy_policy
+
+    engine = RoundEngine(Shoe(6, 0.75, random.Random(seed)), basic_strategy_policy, record=True)
+    with HandLogWriter(path, checksum=checksum) as writer:
+        for game_round in engine.play(rounds, 1.0):
+            writer.write_round(game_round)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bináris leosztásnapló")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    write_parser = commands.add_parser('write', help="Szimulált körök naplózása")
+    write_parser.add_argument('path')
+    write_parser.add_argument('--rounds', type=int, default=100000)
+    write_parser.add_argument('--seed', type=int, default=0)
+    write_parser.add_argument('--no-checksum', action='store_true')
+
+    dump_parser = commands.add_parser('dump', help="Napló kiírása")
+    dump_parser.add_argument('path')
+    dump_parser.add_argument('--limit', type=int, default=10)
+
+    args = parser.parse_args()
+    if args.command == 'write':
+        started = time.perf_counter()
+        write_simulated(args.path, args.rounds, args.seed, not args.no_checksum)
+        elapsed = time.perf_counter() - started
+        print(f"{args.rounds} kör, {elapsed:.2f} s, {args.rounds / elapsed * 60:,.0f} kör/perc")
+    else:
+        with HandLogReader(args.path) as reader:
+            for number, logged in enumerate(reader.rounds()):
+                if number >= args.limit:
+                    break
+                cards = " ".join(str(CARDS[index]) for index in logged.cards)
+                print(f"#{logged.number}: {cards} | döntések: {logged.actions} "
+                      f"| tétek: {logged.bets} | eredmények: {logged.outcomes} | nettó: {logged.net:+g}")
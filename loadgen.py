@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Terhelésgenerátor a játékszerverhez: sok párhuzamos kliens, mindegyik a
+# saját asztalán alapstratégiával játszik. A végén kör/s, kérés/s és a
+# kérések késleltetési percentilisei jelennek meg. Az asztalváltozatnak
+# (--rules) egyeznie kell a szerverével: a kliens ugyanazzal a
+# szabálykészlettel dönti el, mi szabályos, és a változat stratégiáját
+# játssza (feladással együtt).
+#
+#   python loadgen.py --clients 2000 --rounds 50
+#   python loadgen.py --clients 1000 --rounds 20 --spawn-server
+#   python loadgen.py --clients 500 --rounds 20 --rules vegas_h17 --spawn-server
+
+import argparse
+import asyncio
+import json
+import time
+
+from core import ACE, CARDS, Hand
+from engine import STAND, DOUBLE, SPLIT, SURRENDER, RULE_SETS, get_rules
+from strategy import basic_strategy_policy, rules_policy
+
+# Döntés -> protokollparancs
+COMMANDS = {STAND: 'stand', DOUBLE: 'double', SPLIT: 'split', SURRENDER: 'surrender'}
+
+def build_hand(indexes):
+    hand = Hand()
+    for index in indexes:
+        hand.add_card(CARDS[index])
+    return hand
+
+def choose_command(state, rules=None, policy=basic_strategy_policy):
+    # Az aktív kéz döntése a szerver állapotából; a szabálytalan duplázás,
+    # split és feladás lapkérés, mint a motor play_seat-jében
+    rules = get_rules(rules)
+    hands = state['hands']
+    hand = build_hand(hands[state['active']]['cards'])
+    hand.is_split = len(hands) > 1  # Split után minden kéz split kéz
+    # Aktív split ász csak újrasplitre nyitva hagyott, egylapos kéz lehet
+    hand.split_ace = (hand.is_split and rules.split_aces_one_card and
+                      hand.cards[0].rank == ACE)
+    fallback = 'hit' if rules.can_hit(hand) else 'stand'
+    action = policy(hand, CARDS[state['dealer'][0]])
+    if action == DOUBLE and not rules.can_double(hand):
+        return fallback
+    if action == SPLIT and not rules.can_split(hand, len(hands)):
+        return fallback
+    if action == SURRENDER and not rules.can_surrender(hand, len(hands)):
+        return fallback
+    return COMMANDS.get(action, fallback)
+
+class Client:
+    def __init__(self, reader, writer, latencies):
+        self.reader = reader
+        self.writer = writer
+        self.latencies = latencies
+
+    async def request(self, message):
+        started = time.perf_counter()
+        self.writer.write(json.dumps(message, separators=(',', ':')).encode() + b"\n")
+        line = await self.reader.readline()
+        self.latencies.append(time.perf_counter() - started)
+        if not line:
+            raise ConnectionError("A szerver lezárta a kapcsolatot")
+        response = json.loads(line)
+        if not response['ok']:
+            raise RuntimeError(response['error'])
+        return response.get('state')
+
+async def run_client(open_connection, rounds, bet, latencies, rules=None,
+                     policy=basic_strategy_policy):
+    reader, writer = await open_connection()
+    client = Client(reader, writer, latencies)
+    try:
+        await client.request({'cmd': 'join'})
+        for _ in range(rounds):
+            await client.request({'cmd': 'bet', 'amount': bet})
+            state = await client.request({'cmd': 'deal'})
+            while 'outcomes' not in state:
+                state = await client.request({'cmd': choose_command(state, rules, policy),
+                                              'hand': state['active']})
+        await client.request({'cmd': 'leave'})
+    finally:
+        writer.close()
+    return rounds
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+async def run_load(clients, rounds, bet=1000, host='127.0.0.1', port=8765,
+                   unix_path=None, spawn_server=False, concurrency=None, rules=None):
+    rules = get_rules(rules)
+    policy = rules_policy(rules)
+    server_listener = None
+    if spawn_server:
+        # Szerver ugyanabban a folyamatban (egy gépes kapacitásméréshez)
+        from server import GameServer
+        server = GameServer(max_tables=clients, rules=rules)
+        server_listener = await server.start(host, port, unix_path)
+
+    if unix_path:
+        open_connection = lambda: asyncio.open_unix_connection(unix_path)
+    else:
+        open_connection = lambda: asyncio.open_connection(host, port)
+
+    # Egyszerre legfeljebb ennyi kapcsolat nyitható (fájlleíró-korlát)
+    limit = asyncio.Semaphore(concurrency or clients)
+    latencies = []
+
+    async def limited():
+        async with limit:
+            return await run_client(open_connection, rounds, bet, latencies, rules, policy)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(limited() for _ in range(clients)), return_exceptions=True)
+    elapsed = time.perf_counter() - started
+
+    if server_listener is not None:
+        server_listener.close()
+        await server_listener.wait_closed()
+
+    errors = [result for result in results if isinstance(result, BaseException)]
+    completed = sum(result for result in results if not isinstance(result, BaseException))
+    return {
+        'clients': clients,
+        'errors': len(errors),
+        'first_error': repr(errors[0]) if errors else None,
+        'rounds': completed,
+        'requests': len(latencies),
+        'elapsed_s': elapsed,
+        'rounds_per_s': completed / elapsed if elapsed else 0.0,
+        'requests_per_s': len(latencies) / elapsed if elapsed else 0.0,
+        'latency_p50_ms': percentile(latencies, 0.50) * 1000,
+        'latency_p99_ms': percentile(latencies, 0.99) * 1000,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Terhelésgenerátor a blackjack szerverhez")
+    parser.add_argument('--clients', type=int, default=1000)
+    parser.add_argument('--rounds', type=int, default=20, help="Körök száma kliensenként")
+    parser.add_argument('--bet', type=int, default=1000)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="Unix socket útvonala TCP helyett")
+    parser.add_argument('--concurrency', type=int, help="Egyszerre nyitott kapcsolatok legfeljebb")
+    parser.add_argument('--rules', choices=sorted(RULE_SETS), default='classic',
+                        help="Asztalváltozat (a szerverével egyező)")
+    parser.add_argument('--spawn-server', action='store_true',
+                        help="A szerver ebben a folyamatban fut")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load(args.clients, args.rounds, args.bet, args.host, args.port,
+                                  args.unix, args.spawn_server, args.concurrency,
+                                  args.rules))
+    for key, value in report.items():
+        print(f"{key}: {value}")
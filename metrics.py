@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Opcionális mérés a forró pontokon: hívásszám, késleltetés-hisztogram és
+# körönkénti időtartam, Prometheus-szerű szöveges vagy JSON exporttal.
+# Kikapcsolt állapotban nincs semmilyen többletköltség: a bekapcsolás
+# cseréli le az osztályok metódusait időmérő burkolókra, a kikapcsolás
+# visszaállítja az eredetieket. Mellette egy futás közben ki-be
+# kapcsolható mintavételező profilozó és az indulási időmérés is itt van.
+
+import json
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+
+from engine import Round
+
+# Hisztogram-határok másodpercben (Prometheus "le" vödrök)
+LATENCY_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01,
+                   0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+# A motor köre: ezek a metódusok mérhetők GUI nélkül is
+ENGINE_TARGETS = {
+    Round: ('deal', 'hit', 'stand', 'double_down', 'split', 'surrender',
+            'play_dealer_hand', 'settle'),
+}
+ENGINE_ROUND = ((Round, 'deal'), (Round, 'settle'))
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Az utolsó a +Inf vödör
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def cumulative(self):
+        running = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            running += count
+            yield bound, running
+
+class Metrics:
+    def __init__(self):
+        self.histograms = {}
+
+    def observe(self, name, seconds):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.observe(seconds)
+
+    def reset(self):
+        self.histograms.clear()
+
+    def as_dict(self):
+        return {
+            name: {
+                'count': histogram.count,
+                'sum_s': histogram.total,
+                'buckets': {('+Inf' if bound == float('inf') else repr(bound)): count
+                            for bound, count in histogram.cumulative()},
+            }
+            for name, histogram in sorted(self.histograms.items())
+        }
+
+    def prometheus_text(self, prefix='blackjack'):
+        lines = []
+        for name, histogram in sorted(self.histograms.items()):
+            metric = f"{prefix}_{name}_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            for bound, count in histogram.cumulative():
+                label = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{metric}_bucket{{le="{label}"}} {count}')
+            lines.append(f"{metric}_sum {histogram.total!r}")
+            lines.append(f"{metric}_count {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as output:
+            json.dump(self.as_dict(), output, indent=2)
+
+    def write_prometheus(self, path):
+        with open(path, 'w', encoding='utf-8') as output:
+            output.write(self.prometheus_text())
+
+class Instrumentation:
+    def __init__(self, metrics=None):
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.patched = []
+        self.round_started = None
+
+    @property
+    def enabled(self):
+        return bool(self.patched)
+
+    def enable(self, targets, round_markers=None):
+        # targets: {osztály: (metódusnevek)}; round_markers: a kör elejét és
+        # végét jelző (osztály, metódus) pár a körönkénti időtartamhoz
+        if self.patched:
+            return
+        start_marker, end_marker = round_markers if round_markers else (None, None)
+
+        for cls, names in targets.items():
+            for name in names:
+                original = cls.__dict__[name]
+                marker = ('start' if (cls, name) == start_marker else
+                          'end' if (cls, name) == end_marker else None)
+                setattr(cls, name, self.wrap(name, original, marker))
+                self.patched.append((cls, name, original))
+
+    def disable(self):
+        while self.patched:
+            cls, name, original = self.patched.pop()
+            setattr(cls, name, original)
+        self.round_started = None
+
+    def wrap(self, name, original, marker):
+        observe = self.metrics.observe
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            started = clock()
+            if marker == 'start':
+                self.round_started = started
+            try:
+                return original(*args, **kwargs)
+            finally:
+                finished = clock()
+                observe(name, finished - started)
+                if marker == 'end' and self.round_started is not None:
+                    observe('round_duration', finished - self.round_started)
+                    self.round_started = None
+
+        timed.__name__ = original.__name__
+        timed.__wrapped__ = original
+        return timed
+
+class SamplingProfiler:
+    # Háttérszál, amely adott időközönként feljegyzi a figyelt szál veremét
+    def __init__(self, interval=0.005, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.main_thread().ident
+        self.samples = Counter()
+        self.thread = None
+        self.running = threading.Event()
+
+    @property
+    def active(self):
+        return self.running.is_set()
+
+    def start(self):
+        if self.running.is_set():
+            return
+        self.running.set()
+        self.thread = threading.Thread(target=self.run, name="sampling-profiler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running.clear()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def toggle(self):
+        if self.active:
+            self.stop()
+        else:
+            self.start()
+        return self.active
+
+    def run(self):
+        while self.running.is_set():
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                self.samples[";".join(reversed(stack))] += 1
+            time.sleep(self.interval)
+
+    def folded(self):
+        # Flamegraph-eszközök "folded stacks" formátuma
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common()) + "\n"
+
+    def top_functions(self, limit=20):
+        # Mintavételek száma a verem tetején lévő függvényenként
+        leaves = Counter()
+        for stack, count in self.samples.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return leaves.most_common(limit)
+
+    def write_folded(self, path):
+        with open(path, 'w', encoding='utf-8') as output:
+            output.write(self.folded())
+
+class StartupTimer:
+    # Indulási időpontok a kezdethez képest, a hideg indítás követéséhez
+    def __init__(self, started=None):
+        self.started = started if started is not None else time.perf_counter()
+        self.marks = []
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter() - self.started))
+
+    def as_dict(self):
+        # Milliszekundumban, a jelölések sorrendjében
+        return {name: round(seconds * 1000, 3) for name, seconds in self.marks}
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as output:
+            json.dump(self.as_dict(), output, indent=2)
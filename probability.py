@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Az osztó végeredményének pontos valószínűségei a felfordított lap és a
+# cipő maradék összetétele alapján. Az osztó a play_dealer_hand szabálya
+# szerint 17 alatt húz és 17-en megáll; hits_soft_17 esetén (H17) a soft
+# 17-re is húz. A két lapos 21 blackjack.
+# (Azt az esetet, amikor minden játékoskéz besült és az osztó nem húz, a
+# kör kezeli, nem ez a számítás.)
+
+from functools import lru_cache
+
+# Összetétel: darabszámok a 2, 3, ..., 9, 10 (tízes értékűek), ász sorrendben
+FULL_DECK = (4, 4, 4, 4, 4, 4, 4, 4, 16, 4)
+
+# Az eredmények sorrendje a visszaadott valószínűség-tuple-ben
+DEALER_OUTCOMES = ('17', '18', '19', '20', '21', 'bust', 'blackjack')
+FINAL_BUST = 5
+FINAL_BLACKJACK = 6
+
+def shoe_composition(decks=1):
+    return tuple(count * decks for count in FULL_DECK)
+
+def composition_of(cards):
+    # Lapok listájából összetétel (O(n), csak ha nincs kéznél a cipő számlálója)
+    counts = [0] * 10
+    for card in cards:
+        counts[card.points - 2] += 1
+    return tuple(counts)
+
+def remove_card(composition, points):
+    index = points - 2
+    return composition[:index] + (composition[index] - 1,) + composition[index + 1:]
+
+@lru_cache(maxsize=1 << 18)
+def dealer_distribution(hard_value, aces, card_count, composition, hits_soft_17=False):
+    # Egy osztói kézállapot végeredmény-eloszlása; az ászok 1-ként vannak a
+    # hard_value-ban, egy ász 11, ha belefér
+    soft = aces and hard_value <= 11
+    value = hard_value + 10 if soft else hard_value
+
+    if value >= 17 and not (hits_soft_17 and soft and value == 17):
+        result = [0.0] * 7
+        if value > 21:
+            result[FINAL_BUST] = 1.0
+        elif value == 21 and card_count == 2:
+            result[FINAL_BLACKJACK] = 1.0
+        else:
+            result[value - 17] = 1.0
+        return tuple(result)
+
+    remaining = sum(composition)
+    if remaining == 0:
+        # Kifogyott cipő: a pakli újrakeveredik, mint a Shoe.deal-nél
+        composition = FULL_DECK
+        remaining = sum(composition)
+
+    result = [0.0] * 7
+    next_count = min(card_count + 1, 3)  # 2 felett a lapszám már nem számít
+    for index, count in enumerate(composition):
+        if not count:
+            continue
+        points = index + 2
+        if points == 11:
+            sub = dealer_distribution(hard_value + 1, True, next_count,
+                                      remove_card(composition, points), hits_soft_17)
+        else:
+            sub = dealer_distribution(hard_value + points, aces, next_count,
+                                      remove_card(composition, points), hits_soft_17)
+        probability = count / remaining
+        for i in range(7):
+            result[i] += probability * sub[i]
+    return tuple(result)
+
+@lru_cache(maxsize=4096)
+def cached_dealer_probabilities(upcard, composition, hits_soft_17=False):
+    if upcard == 11:
+        return dealer_distribution(1, True, 1, composition, hits_soft_17)
+    return dealer_distribution(upcard, False, 1, composition, hits_soft_17)
+
+def dealer_probabilities(upcard, composition, hits_soft_17=False):
+    # upcard: Card vagy lapérték (2-11); composition: a maradék lapok
+    # összetétele a felfordított lap nélkül (a rejtett lap is ebből jön)
+    if not isinstance(upcard, int):
+        upcard = upcard.points
+    return cached_dealer_probabilities(upcard, tuple(composition), hits_soft_17)
+
+def cache_info():
+    return {
+        'queries': cached_dealer_probabilities.cache_info()._asdict(),
+        'states': dealer_distribution.cache_info()._asdict(),
+    }
+
+def clear_cache():
+    cached_dealer_probabilities.cache_clear()
+    dealer_distribution.cache_clear()
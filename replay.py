@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Felvett körök visszajátszása a leosztásnaplóból (handlog.py). A kör
+# lapjai a felvett sorrendben jönnek, a játékos döntései ugyanazokon a
+# Round-metódusokon mennek át, mint élőben, az elszámolás pedig a motor
+# settle-je (a check_winners logikája). Így egy szabály- vagy
+# kifizetésváltozás után a régi körök újra elszámolhatók, akár másik
+# asztalváltozat (engine.RULE_SETS) szabályaival is; az ott szabálytalan
+# döntést tartalmazó körök hiányosnak számítanak.
+#
+#   python replay.py naplo1.bjl naplo2.bjl --workers 2
+#   python replay.py naplo.bjl --rules six_to_five
+#   python replay.py naplo.bjl --gui --delay 300
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from core import CARDS
+from engine import Round, RULE_SETS, HIT, STAND, DOUBLE, SPLIT, SURRENDER
+from handlog import HandLogReader
+
+class ReplayError(Exception):
+    pass
+
+class ReplayShoe:
+    # A Shoe felülete egyetlen felvett kör lapjaival; nem kever, és ha a
+    # kör több lapot kérne, mint amennyit felvettünk, hibát jelez
+    def __init__(self):
+        self.indexes = ()
+        self.position = 0
+        self.running_count = 0
+        self.listeners = []
+
+    def load(self, indexes):
+        self.indexes = indexes
+        self.position = 0
+
+    def start_round(self, cards_needed=0):
+        pass
+
+    def deal(self):
+        position = self.position
+        if position >= len(self.indexes):
+            raise ReplayError("A kör több lapot kér, mint amennyi fel van véve")
+        self.position = position + 1
+
+        card = CARDS[self.indexes[position]]
+        self.running_count += card.hi_lo
+        for listener in self.listeners:
+            listener(self, card)
+        return card
+
+    def discard(self, cards):
+        pass
+
+    def cards_remaining(self):
+        return len(self.indexes) - self.position
+
+    def true_count(self):
+        # A felvett cipő mérete nem ismert, valós számolás nincs
+        return 0.0
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self.listeners.remove(listener)
+
+def base_bet(logged):
+    # Az első kéz tétje csak duplázáskor változik, a split kezek ezt másolják
+    bet = logged.bets[0]
+    if (0, DOUBLE) in logged.actions:
+        bet /= 2
+    return bet
+
+# Döntés -> a Round megfelelő metódusa
+ROUND_ACTIONS = {
+    HIT: Round.hit,
+    STAND: Round.stand,
+    DOUBLE: Round.double_down,
+    SPLIT: Round.split,
+    SURRENDER: Round.surrender,
+}
+
+def replay_round(logged, shoe=None, rules=None):
+    # Egy felvett kör (handlog.LoggedRound) újrajátszása és elszámolása
+    if shoe is None:
+        shoe = ReplayShoe()
+    shoe.load(logged.cards)
+
+    game_round = Round(shoe, base_bet(logged), rules)
+    game_round.deal()
+    for hand_index, action in logged.actions:
+        if not ROUND_ACTIONS[action](game_round, hand_index):
+            raise ReplayError(f"Szabálytalan döntés a(z) {logged.number}. körben: "
+                              f"kéz {hand_index}, döntés {action}")
+    if not game_round.is_player_done():
+        raise ReplayError(f"A(z) {logged.number}. kör döntései hiányosak")
+
+    game_round.play_dealer_hand()
+    game_round.settle()
+    return game_round
+
+class ReplayStats:
+    def __init__(self):
+        self.rounds = 0
+        self.changed = 0       # Eltérő nettó eredmény, mint a felvételen
+        self.incomplete = 0    # A felvett lapokból nem játszható végig
+        self.recorded_net = 0.0
+        self.replayed_net = 0.0
+
+    def add(self, logged, game_round):
+        net = game_round.net()
+        self.rounds += 1
+        self.recorded_net += logged.net
+        self.replayed_net += net
+        if net != logged.net:
+            self.changed += 1
+
+    def merge(self, other):
+        self.rounds += other.rounds
+        self.changed += other.changed
+        self.incomplete += other.incomplete
+        self.recorded_net += other.recorded_net
+        self.replayed_net += other.replayed_net
+        return self
+
+    def as_dict(self):
+        return {
+            'rounds': self.rounds,
+            'changed': self.changed,
+            'incomplete': self.incomplete,
+            'recorded_net': self.recorded_net,
+            'replayed_net': self.replayed_net,
+        }
+
+def replay_file(path, rules=None):
+    # Fej nélküli, teljes sebességű visszajátszás; a napló mmap-elve marad
+    stats = ReplayStats()
+    shoe = ReplayShoe()
+    with HandLogReader(path) as reader:
+        for logged in reader.rounds():
+            try:
+                game_round = replay_round(logged, shoe, rules)
+            except ReplayError:
+                stats.incomplete += 1
+                continue
+            stats.add(logged, game_round)
+    return stats
+
+def replay_files(paths, workers=1, rules=None):
+    # Fájlonként egy feladat; az eredmények a fájlok sorrendjében egyesülnek
+    if workers == 1 or len(paths) < 2:
+        partials = [replay_file(path, rules) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            partials = list(executor.map(replay_file, paths, [rules] * len(paths)))
+
+    total = ReplayStats()
+    for partial in partials:
+        total.merge(partial)
+    return total
+
+class ReplayPlayer:
+    # A BlackjackGame ablak vezérlése felvett körökkel, állítható
+    # késleltetéssel (ms) lépésenként
+    def __init__(self, window, rounds, delay=500):
+        self.window = window
+        self.rounds = iter(rounds)
+        self.delay = delay
+        self.paused = False
+        self.actions = []
+        self.shoe = ReplayShoe()
+
+    def set_delay(self, delay):
+        self.delay = max(0, delay)
+        self.window.dealer_delay = self.delay
+        self.window.statusBar().showMessage(f"Visszajátszás: {self.delay} ms / lépés")
+
+    def faster(self):
+        self.set_delay(self.delay // 2)
+
+    def slower(self):
+        self.set_delay(max(self.delay * 2, 10))
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+        if not self.paused:
+            self.schedule(self.step)
+
+    def schedule(self, callback):
+        from PyQt5.QtCore import QTimer
+        QTimer.singleShot(self.delay, callback)
+
+    def start(self):
+        self.window.dealer_delay = self.delay
+        self.next_round()
+
+    def next_round(self):
+        logged = next(self.rounds, None)
+        if logged is None:
+            self.window.statusBar().showMessage("Visszajátszás vége")
+            return
+
+        window = self.window
+        self.shoe.load(logged.cards)
+        self.actions = list(logged.actions)
+        window.deck = self.shoe
+
+        bet = base_bet(logged)
+        window.set_bet(int(bet) if bet == int(bet) else bet)
+        window.deal_cards()
+        self.schedule(self.step)
+
+    def step(self):
+        if self.paused:
+            return
+        game_round = self.window.round
+
+        if game_round.outcomes is not None:
+            self.next_round()
+        elif game_round.is_player_done() or not self.actions:
+            # Az osztó a saját időzítőjével húz; megvárjuk az elszámolást
+            self.schedule(self.step)
+        else:
+            hand_index, action = self.actions.pop(0)
+            window = self.window
+            if action == HIT:
+                window.hit(hand_index)
+            elif action == STAND:
+                window.stand(hand_index)
+            elif action == DOUBLE:
+                window.double_down(hand_index)
+            elif action == SURRENDER:
+                window.surrender(hand_index)
+            else:
+                window.split(hand_index)
+            self.schedule(self.step)
+
+def run_gui(path, delay, rules=None):
+    import sys
+    from PyQt5.QtGui import QKeySequence
+    from PyQt5.QtWidgets import QApplication, QShortcut
+    import blackjack
+
+    app = QApplication(sys.argv[:1])
+    window = blackjack.BlackjackGame(rules=rules)
+    reader = HandLogReader(path)
+    player = ReplayPlayer(window, reader.rounds(), delay)
+
+    # Sebesség: + gyorsabb, - lassabb, szóköz szünet
+    QShortcut(QKeySequence("+"), window, player.faster)
+    QShortcut(QKeySequence("-"), window, player.slower)
+    QShortcut(QKeySequence("Space"), window, player.toggle_pause)
+
+    window.show()
+    player.start()
+    status = app.exec_()
+    reader.close()
+    return status
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Felvett körök visszajátszása")
+    parser.add_argument('paths', nargs='+', help="Leosztásnapló-fájlok")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--gui', action='store_true', help="Visszajátszás az ablakban (az első fájl)")
+    parser.add_argument('--delay', type=int, default=500, help="Késleltetés lépésenként (ms)")
+    parser.add_argument('--rules', choices=sorted(RULE_SETS), default='classic',
+                        help="Asztalváltozat az újraelszámoláshoz")
+    args = parser.parse_args()
+
+    if args.gui:
+        raise SystemExit(run_gui(args.paths[0], args.delay, args.rules))
+
+    started = time.perf_counter()
+    stats = replay_files(args.paths, args.workers, args.rules)
+    elapsed = time.perf_counter() - started
+    for key, value in stats.as_dict().items():
+        print(f"{key}: {value}")
+    print(f"{stats.rounds / elapsed * 60:,.0f} kör/perc")
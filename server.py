@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Többasztalos asyncio játékszerver soronként egy JSON üzenetes protokollal
+# (TCP a localhoston vagy Unix socket). Minden asztal független, saját
+# cipővel és körrel; a menet ugyanaz, mint az ablakban: tét (bet), osztás
+# (deal), döntések, majd az osztó és az elszámolás automatikusan jön.
+#
+# Kérések:   {"cmd": "join"}  {"cmd": "bet", "amount": 1000}  {"cmd": "deal"}
+#            {"cmd": "hit", "hand": 0}  (stand, double, split, surrender ugyanígy)
+#            {"cmd": "state"}  {"cmd": "leave"}
+# Válaszok:  {"ok": true, "state": {...}} vagy {"ok": false, "error": "..."}
+#
+#   python server.py --port 8765 --max-tables 10000
+#   python server.py --rules vegas_h17
+#   python server.py --shuffler default --shuffle-seed 1   (csak teszthez)
+
+import argparse
+import asyncio
+import json
+import os
+
+from core import Shoe, SHUFFLERS, make_shuffler
+from engine import Round, RULE_SETS, get_rules
+
+START_MONEY = 1000000
+MAX_LINE = 4096  # Egy kérés legnagyobb hossza bájtban
+
+class TableError(Exception):
+    pass
+
+class Table:
+    # Egy asztal egy játékossal; csak az aktuális kört tartja meg, így a
+    # memóriaigény asztalonként korlátos
+    __slots__ = ('table_id', 'shoe', 'rules', 'round', 'money', 'current_bet', 'rounds_played')
+
+    def __init__(self, table_id, decks=6, penetration=0.75, rng=None, rules=None):
+        self.table_id = table_id
+        self.shoe = Shoe(decks, penetration, rng)
+        self.rules = get_rules(rules)
+        self.round = None
+        self.money = START_MONEY
+        self.current_bet = 0
+        self.rounds_played = 0
+
+    def in_round(self):
+        return self.round is not None and self.round.outcomes is None
+
+    def place_bet(self, amount):
+        if self.in_round():
+            raise TableError("Kör közben nem lehet tétet tenni")
+        if self.current_bet:
+            raise TableError("Már van tét")
+        if not isinstance(amount, int) or amount <= 0:
+            raise TableError("Érvénytelen tét")
+        if amount > self.money:
+            raise TableError("Nincs elég pénzed")
+        self.money -= amount
+        self.current_bet = amount
+
+    def deal_cards(self):
+        if self.in_round():
+            raise TableError("A kör már folyamatban van")
+        if not self.current_bet:
+            raise TableError("Előbb tétet kell tenni")
+
+        self.round = Round(self.shoe, self.current_bet, self.rules, record=False)
+        self.round.deal()
+        self.finish_if_done()
+
+    def action(self, name, hand_index):
+        if not self.in_round():
+            raise TableError("Nincs folyamatban lévő kör")
+        game_round = self.round
+        if not isinstance(hand_index, int) or not game_round.is_hand_playable(hand_index):
+            raise TableError("Ez a kéz most nem játszható")
+
+        if name == 'hit':
+            if not game_round.hit(hand_index):
+                raise TableError("A lépés most nem szabályos")
+        elif name == 'stand':
+            game_round.stand(hand_index)
+        elif name == 'surrender':
+            if not game_round.surrender(hand_index):
+                raise TableError("A lépés most nem szabályos")
+        else:
+            # Duplázás és split csak fedezettel, mint az ablakban
+            hand = game_round.hands[hand_index]
+            if self.money < hand.bet:
+                raise TableError("Nincs elég pénzed")
+            bet = hand.bet
+            if name == 'double':
+                done = game_round.double_down(hand_index)
+            else:
+                done = game_round.split(hand_index)
+            if not done:
+                raise TableError("A lépés most nem szabályos")
+            self.money -= bet
+
+        self.finish_if_done()
+
+    def finish_if_done(self):
+        # A játékos végzett: az osztó húz, majd az elszámolás
+        game_round = self.round
+        if not game_round.is_player_done():
+            return
+        game_round.play_dealer_hand()
+        game_round.settle()
+        self.money += sum(int(payout) for payout in game_round.payouts)
+        self.current_bet = 0
+        self.rounds_played += 1
+
+    def state(self):
+        state = {
+            'table': self.table_id,
+            'money': self.money,
+            'bet': self.current_bet,
+            'rounds': self.rounds_played,
+        }
+        game_round = self.round
+        if game_round is None:
+            return state
+
+        finished = game_round.outcomes is not None
+        dealer_cards = [card.index for card in game_round.dealer_hand.cards]
+        state['dealer'] = dealer_cards if finished else dealer_cards[:1]
+        state['hands'] = [{'cards': [card.index for card in hand.cards],
+                           'value': hand.calculate_value(),
+                           'bet': hand.bet}
+                          for hand in game_round.hands]
+        state['active'] = game_round.active_hand_index
+        if finished:
+            state['dealer_value'] = game_round.dealer_hand.calculate_value()
+            state['outcomes'] = game_round.outcomes
+            state['payouts'] = game_round.payouts
+        return state
+
+class GameServer:
+    def __init__(self, max_tables=10000, decks=6, penetration=0.75, rules=None, shuffler=None):
+        self.max_tables = max_tables
+        self.decks = decks
+        self.penetration = penetration
+        self.shuffler = shuffler  # Az asztalok közös keverője (core.make_shuffler)
+        self.rules = get_rules(rules)  # Minden asztal ugyanazzal a változattal
+        self.tables = {}
+        self.next_table_id = 0
+        self.requests_handled = 0
+
+    def open_table(self):
+        if len(self.tables) >= self.max_tables:
+            raise TableError("Nincs szabad asztal")
+        table = Table(self.next_table_id, self.decks, self.penetration, self.shuffler, self.rules)
+        self.tables[table.table_id] = table
+        self.next_table_id += 1
+        return table
+
+    def close_table(self, table):
+        if table is not None:
+            self.tables.pop(table.table_id, None)
+
+    def handle(self, table, request):
+        # Egy kérés feldolgozása; visszaadja az (esetleg új) asztalt és a választ
+        command = request.get('cmd')
+        if command == 'join':
+            if table is not None:
+                raise TableError("Már ülsz egy asztalnál")
+            table = self.open_table()
+        elif table is None:
+            raise TableError("Előbb csatlakozni kell egy asztalhoz")
+        elif command == 'bet':
+            table.place_bet(request.get('amount'))
+        elif command == 'deal':
+            table.deal_cards()
+        elif command in ('hit', 'stand', 'double', 'split', 'surrender'):
+            table.action(command, request.get('hand', table.round.active_hand_index
+                                              if table.round is not None else 0))
+        elif command == 'leave':
+            self.close_table(table)
+            return None, {'ok': True}
+        elif command != 'state':
+            raise TableError(f"Ismeretlen parancs: {command}")
+        return table, {'ok': True, 'state': table.state()}
+
+    async def serve_client(self, reader, writer):
+        table = None
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Túl hosszú sor: a kapcsolatot lezárjuk
+                    break
+                if not line:
+                    break
+                leaving = False
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise TableError("A kérésnek JSON objektumnak kell lennie")
+                    table, response = self.handle(table, request)
+                    leaving = request.get('cmd') == 'leave'
+                except (TableError, ValueError) as error:
+                    response = {'ok': False, 'error': str(error)}
+                self.requests_handled += 1
+
+                writer.write(json.dumps(response, separators=(',', ':')).encode() + b"\n")
+                await writer.drain()
+                if leaving:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.close_table(table)
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=8765, unix_path=None):
+        if unix_path:
+            if os.path.exists(unix_path):
+                os.unlink(unix_path)
+            return await asyncio.start_unix_server(self.serve_client, unix_path, limit=MAX_LINE,
+                                                   backlog=4096)
+        return await asyncio.start_server(self.serve_client, host, port, limit=MAX_LINE,
+                                          backlog=4096)
+
+async def main(args):
+    server = GameServer(args.max_tables, args.decks, args.penetration, args.rules,
+                        make_shuffler(args.shuffler, args.shuffle_seed))
+    listener = await server.start(args.host, args.port, args.unix)
+    address = args.unix or f"{args.host}:{args.port}"
+    print(f"Szerver fut: {address}, legfeljebb {args.max_tables} asztal")
+    async with listener:
+        await listener.serve_forever()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Többasztalos blackjack szerver")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="Unix socket útvonala TCP helyett")
+    parser.add_argument('--max-tables', type=int, default=10000)
+    parser.add_argument('--decks', type=int, default=6)
+    parser.add_argument('--penetration', type=float, default=0.75)
+    parser.add_argument('--rules', choices=sorted(RULE_SETS), default='classic',
+                        help="Asztalváltozat")
+    parser.add_argument('--shuffler', choices=SHUFFLERS, default='secure',
+                        help="Keverő (secure: kriptográfiailag biztonságos)")
+    parser.add_argument('--shuffle-seed', type=int,
+                        help="Determinisztikus keverés teszthez")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Többmagos Monte Carlo futtató. A köröket folyamatkészlet osztja szét,
+# minden worker a fő seedből levezetett saját, független véletlenszám-
+# folyamot kap. A részeredmények workerindex szerinti sorrendben
+# egyesülnek, így azonos seed és workerszám bitre azonos összesítést ad.
+
+import argparse
+import hashlib
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Pipe, Process
+from statistics import NormalDist
+
+from core import make_shoe
+from engine import (RoundEngine, RULE_SETS, WIN_OUTCOMES, PUSH_OUTCOMES, LOSS_OUTCOMES,
+                    BLACKJACK_OUTCOMES)
+from strategy import basic_strategy_policy
+
+class SimulationStats:
+    # Futó összesítés: a körönkénti nettó átlaga és szórása Welford-módszerrel
+    # (mean_net, m2 = az átlagtól vett eltérésnégyzetek összege), így a
+    # konfidenciaintervallum a futás közben is bármikor lekérdezhető
+    def __init__(self):
+        self.rounds = 0
+        self.hands = 0
+        self.wins = 0
+        self.losses = 0
+        self.pushes = 0
+        self.blackjacks = 0
+        self.net = 0.0
+        self.net_squares = 0.0
+        self.mean_net = 0.0
+        self.m2 = 0.0
+
+    def add_round(self, game_round):
+        self.add(game_round.net(), game_round.outcomes)
+
+    def add_record(self, record):
+        # Tömör körrekord (handlog.LoggedRound, stream.round_record)
+        self.add(record.net, record.outcomes)
+
+    def add(self, net, outcomes):
+        self.rounds += 1
+        self.net += net
+        self.net_squares += net * net
+        delta = net - self.mean_net
+        self.mean_net += delta / self.rounds
+        self.m2 += delta * (net - self.mean_net)
+
+        for outcome in outcomes:
+            self.hands += 1
+            if outcome in WIN_OUTCOMES:
+                self.wins += 1
+            elif outcome in PUSH_OUTCOMES:
+                self.pushes += 1
+            else:
+                self.losses += 1
+            if outcome in BLACKJACK_OUTCOMES:
+                self.blackjacks += 1
+
+    def add_batch(self, result):
+        # A BatchSimulator.run eredményének hozzáadása
+        outcomes = result['outcomes']
+        self.add_moments(result['rounds'], result['mean'], result['m2'])
+        self.rounds += result['rounds']
+        self.net += result['net']
+        self.net_squares += result['net_squares']
+        self.hands += sum(outcomes)
+        self.wins += sum(outcomes[outcome] for outcome in WIN_OUTCOMES)
+        self.pushes += sum(outcomes[outcome] for outcome in PUSH_OUTCOMES)
+        self.losses += sum(outcomes[outcome] for outcome in LOSS_OUTCOMES)
+        self.blackjacks += sum(outcomes[outcome] for outcome in BLACKJACK_OUTCOMES)
+
+    def add_moments(self, rounds, mean, m2):
+        # Két részösszesítés átlagának és m2-jének összevonása (Chan);
+        # a körszámot a hívó növeli
+        if not rounds:
+            return
+        total = self.rounds + rounds
+        delta = mean - self.mean_net
+        self.mean_net += delta * rounds / total
+        self.m2 += m2 + delta * delta * self.rounds * rounds / total
+
+    def merge(self, other):
+        self.add_moments(other.rounds, other.mean_net, other.m2)
+        self.rounds += other.rounds
+        self.hands += other.hands
+        self.wins += other.wins
+        self.losses += other.losses
+        self.pushes += other.pushes
+        self.blackjacks += other.blackjacks
+        self.net += other.net
+        self.net_squares += other.net_squares
+        return self
+
+    def mean(self):
+        return self.mean_net
+
+    def variance(self):
+        if self.rounds < 2:
+            return 0.0
+        return self.m2 / (self.rounds - 1)
+
+    def standard_error(self):
+        if self.rounds < 2:
+            return math.inf
+        return math.sqrt(self.variance() / self.rounds)
+
+    def half_width(self, confidence=0.95):
+        # A körönkénti nettó átlagának konfidencia-félszélessége (normális közelítés)
+        return z_value(confidence) * self.standard_error()
+
+    def confidence_interval(self, confidence=0.95):
+        half_width = self.half_width(confidence)
+        return self.mean_net - half_width, self.mean_net + half_width
+
+    def rate(self, count):
+        # Kézre vetített arány (nyerés, döntetlen, vesztés, blackjack)
+        return count / self.hands if self.hands else 0.0
+
+    def rate_half_width(self, count, confidence=0.95):
+        if not self.hands:
+            return math.inf
+        rate = self.rate(count)
+        return z_value(confidence) * math.sqrt(rate * (1 - rate) / self.hands)
+
+    def counts(self):
+        # A check_winners-kategóriák kézszámai
+        return {
+            'win': self.wins,
+            'push': self.pushes,
+            'loss': self.losses,
+            'blackjack': self.blackjacks,
+        }
+
+    def rates(self):
+        return {key: self.rate(count) for key, count in self.counts().items()}
+
+    def summary(self, confidence=0.95):
+        # Egysoros állapot: átlag ± félszélesség és az arányok
+        rates = self.rates()
+        return (f"{self.rounds:,} kör, átlag: {self.mean_net:+.5f} "
+                f"± {self.half_width(confidence):.5f} egység/kör ({confidence:.0%}), "
+                f"nyerés/döntetlen/vesztés/blackjack: {rates['win']:.2%}/"
+                f"{rates['push']:.2%}/{rates['loss']:.2%}/{rates['blackjack']:.2%}")
+
+    def as_dict(self):
+        return {
+            'rounds': self.rounds,
+            'hands': self.hands,
+            'wins': self.wins,
+            'losses': self.losses,
+            'pushes': self.pushes,
+            'blackjacks': self.blackjacks,
+            'net': self.net,
+            'net_squares': self.net_squares,
+            'mean': self.mean(),
+            'variance': self.variance(),
+            'std_error': self.standard_error(),
+        }
+
+def z_value(confidence):
+    # Kétoldali normális kritikus érték, pl. 0.95 -> 1.96
+    return NormalDist().inv_cdf((1 + confidence) / 2)
+
+class HiLoBetSpread:
+    # Tétemelés a Hi-Lo valós számolás szerint: (valós számolás - 1)
+    # egység, legalább 1 és legfeljebb max_units egység
+    def __init__(self, max_units=8, unit=1.0):
+        self.max_units = max_units
+        self.unit = unit
+
+    def __call__(self, shoe):
+        units = int(shoe.true_count()) - 1
+        return self.unit * min(max(units, 1), self.max_units)
+
+def worker_seed(seed, worker):
+    # Független folyam workerenként: a (seed, index) pár SHA-256 kivonata
+    digest = hashlib.sha256(f"{seed}:{worker}".encode()).digest()
+    return int.from_bytes(digest[:8], 'little')
+
+def split_rounds(rounds, workers):
+    # Determinisztikus felosztás: az első maradék worker eggyel többet kap
+    base, extra = divmod(rounds, workers)
+    return [base + (1 if i < extra else 0) for i in range(workers)]
+
+def run_engine_chunk(seed, rounds, policy, bet, decks, penetration, rules='classic',
+                     holdback=None):
+    shoe = make_shoe(decks, penetration, random.Random(seed), holdback)
+    engine = RoundEngine(shoe, policy, rules)
+    stats = SimulationStats()
+    for game_round in engine.play(rounds, bet):
+        stats.add_round(game_round)
+    return stats
+
+def run_batch_chunk(seed, rounds, tables, bet, decks, penetration, rules='classic'):
+    # Asztalonként rounds // tables kör (felfelé kerekítve)
+    from batch import BatchSimulator
+
+    stats = SimulationStats()
+    if rounds:
+        simulator = BatchSimulator(min(tables, rounds), decks, penetration, seed, rules=rules)
+        stats.add_batch(simulator.run(-(-rounds // simulator.tables), bet))
+    return stats
+
+def run_chunk(task):
+    backend, seed, rounds, policy, bet, tables, decks, penetration, rules, holdback = task
+    if backend == 'batch':
+        return run_batch_chunk(seed, rounds, tables, bet, decks, penetration, rules)
+    return run_engine_chunk(seed, rounds, policy, bet, decks, penetration, rules, holdback)
+
+def check_backend(backend, bet, holdback):
+    if backend == 'batch' and callable(bet):
+        raise ValueError("A batch backend csak fix tétet támogat")
+    if backend == 'batch' and holdback is not None:
+        raise ValueError("A batch backend nem ismeri a folyamatos keverőgépet")
+
+def run_simulation(rounds, workers=1, seed=0, policy=basic_strategy_policy,
+                   bet=1.0, backend='engine', tables=10000, decks=6,
+                   penetration=0.75, rules='classic', holdback=None):
+    # A policy-nek (és a függvényként megadott tétnek) modulszintűnek kell
+    # lennie (pickle miatt); a kötegelt szimulátor csak fix tétet ismer.
+    # rules: változatnév (engine.RULE_SETS) vagy RuleSet; holdback: None =
+    # cipő vágókártyával, egész = folyamatos keverőgép (core.ContinuousShoe)
+    check_backend(backend, bet, holdback)
+
+    tasks = [(backend, worker_seed(seed, worker), chunk, policy, bet, tables,
+              decks, penetration, rules, holdback)
+             for worker, chunk in enumerate(split_rounds(rounds, workers))]
+
+    if workers == 1:
+        partials = [run_chunk(tasks[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            partials = list(executor.map(run_chunk, tasks))
+
+    # Egyesítés mindig workerindex szerinti sorrendben
+    total = SimulationStats()
+    for partial in partials:
+        total.merge(partial)
+    return total
+
+# A szakaszos futás leállási okai
+STOP_REASONS = {
+    'precision': "elérte a kért pontosságot",
+    'time': "lejárt az időkeret",
+    'rounds': "elérte a körszámot",
+}
+
+class SequentialWorker:
+    # Egy worker állapota a szakaszos futás teljes idejére: ugyanaz a motor
+    # (cipő) vagy kötegelt szimulátor játssza az összes szakaszát, így a
+    # lejátszott körök nem függnek attól, milyen gyakran ellenőrzünk
+    def __init__(self, backend, seed, policy, bet, tables, decks, penetration, rules, holdback):
+        self.bet = bet
+        self.engine = None
+        self.simulator = None
+        if backend == 'batch':
+            from batch import BatchSimulator
+            self.simulator = BatchSimulator(tables, decks, penetration, seed, rules=rules)
+        else:
+            shoe = make_shoe(decks, penetration, random.Random(seed), holdback)
+            self.engine = RoundEngine(shoe, policy, rules)
+
+    def run(self, rounds):
+        stats = SimulationStats()
+        if self.engine is not None:
+            for game_round in self.engine.play(rounds, self.bet):
+                stats.add_round(game_round)
+        elif rounds > 0:
+            # Asztalonként felfelé kerekítve, mint a run_batch_chunk
+            simulator = self.simulator
+            stats.add_batch(simulator.run(-(-rounds // simulator.tables), self.bet))
+        return stats
+
+def sequential_worker(connection, task):
+    # Hosszú életű worker folyamat: körszámot kap, részeredményt küld vissza,
+    # None-ra kilép; a hibát válaszként küldi, hogy a hívóban jelenjen meg
+    worker = None
+    for rounds in iter(connection.recv, None):
+        try:
+            if worker is None:
+                worker = SequentialWorker(*task)
+            result = worker.run(rounds)
+        except Exception as error:
+            result = error
+        connection.send(result)
+    connection.close()
+
+def run_sequential(precision=None, time_budget=None, max_rounds=None, workers=1, seed=0,
+                   policy=basic_strategy_policy, bet=1.0, backend='engine', tables=10000,
+                   decks=6, penetration=0.75, rules='classic', confidence=0.95,
+                   check_every=100000, progress=None, holdback=None):
+    # Szakaszos futás: check_every körönként összevonja a részeredményeket,
+    # és leáll, ha az átlag konfidencia-félszélessége legfeljebb precision
+    # egység/kör, ha lejárt a time_budget (mp), vagy ha elérte a max_rounds-ot.
+    # Az ellenőrzés szakaszhatáron történik, így az időkeretet legfeljebb egy
+    # szakasz ideje lépheti túl. Minden worker a futás végéig ugyanazt a
+    # cipőt folytatja (worker_seed(seed, index)), és az eddigi összes kör
+    # split_rounds szerinti részét játssza, így a motorral N kör ugyanaz,
+    # mint run_simulation(N, workers): a szakaszolás csak a leállást dönti el.
+    # Visszatérés: (SimulationStats, leállási ok kulcsa a STOP_REASONS-ben)
+    if precision is None and time_budget is None and max_rounds is None:
+        raise ValueError("Pontosság, időkeret vagy körszám kell a leálláshoz")
+    check_backend(backend, bet, holdback)
+
+    # A kötegelt szimulátor asztalszáma az első szakaszhoz igazodik
+    tables = min(tables, max(1, check_every // workers))
+    tasks = [(backend, worker_seed(seed, worker), policy, bet, tables, decks, penetration,
+              rules, holdback)
+             for worker in range(workers)]
+
+    local = None
+    connections = []
+    processes = []
+    if workers == 1:
+        local = SequentialWorker(*tasks[0])
+    else:
+        for task in tasks:
+            connection, child = Pipe()
+            process = Process(target=sequential_worker, args=(child, task), daemon=True)
+            process.start()
+            child.close()
+            connections.append(connection)
+            processes.append(process)
+
+    total = SimulationStats()
+    started = time.perf_counter()
+    requested = 0
+    played = [0] * workers
+    try:
+        while True:
+            rounds = check_every
+            if max_rounds is not None:
+                rounds = min(rounds, max_rounds - total.rounds)
+            requested += rounds
+            shares = [max(0, share - done)
+                      for share, done in zip(split_rounds(requested, workers), played)]
+
+            if local is not None:
+                partials = [local.run(shares[0])]
+            else:
+                for connection, share in zip(connections, shares):
+                    connection.send(share)
+                partials = [connection.recv() for connection in connections]
+            for worker, partial in enumerate(partials):
+                if isinstance(partial, Exception):
+                    raise partial
+                played[worker] += partial.rounds
+                total.merge(partial)
+
+            if progress is not None:
+                progress(total, time.perf_counter() - started)
+
+            if precision is not None and total.half_width(confidence) <= precision:
+                return total, 'precision'
+            if time_budget is not None and time.perf_counter() - started >= time_budget:
+                return total, 'time'
+            if max_rounds is not None and total.rounds >= max_rounds:
+                return total, 'rounds'
+    finally:
+        for connection in connections:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+            connection.close()
+        for process in processes:
+            process.join()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Blackjack Monte Carlo szimuláció")
+    parser.add_argument('--rounds', type=int,
+                        help="Körszám (alapból 1000000; szakaszos futásnál felső korlát)")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--backend', choices=['engine', 'batch'], default='engine')
+    parser.add_argument('--decks', type=int, default=6)
+    parser.add_argument('--penetration', type=float, default=0.75)
+    parser.add_argument('--rules', choices=sorted(RULE_SETS), default='classic',
+                        help="Asztalváltozat")
+    parser.add_argument('--bet-spread', type=int, default=0,
+                        help="Hi-Lo tétemelés legfeljebb ennyi egységig (0 = fix tét)")
+    parser.add_argument('--csm', type=int, nargs='?', const=0, metavar='HOLDBACK',
+                        help="Folyamatos keverőgép, ennyi visszatartott lappal (alapból 0)")
+    parser.add_argument('--precision', type=float,
+                        help="Leállás, ha az átlag félszélessége legfeljebb ennyi egység/kör")
+    parser.add_argument('--time-budget', type=float, help="Leállás ennyi másodperc után")
+    parser.add_argument('--confidence', type=float, default=0.95)
+    parser.add_argument('--check-every', type=int, default=100000,
+                        help="Szakaszos futásnál ennyi körönként ellenőriz és jelez")
+    args = parser.parse_args()
+    if args.backend == 'batch' and args.csm is not None:
+        parser.error("A batch backend nem ismeri a folyamatos keverőgépet (--csm)")
+    if args.csm is not None and not 0 <= args.csm < args.decks * 52:
+        parser.error(f"A visszatartott lapok száma 0 és {args.decks * 52 - 1} között lehet")
+
+    bet = HiLoBetSpread(args.bet_spread) if args.bet_spread else 1.0
+    options = dict(seed=args.seed, bet=bet, backend=args.backend, decks=args.decks,
+                   penetration=args.penetration, rules=args.rules, holdback=args.csm)
+
+    if args.precision is not None or args.time_budget is not None:
+        def report(stats, elapsed):
+            print(f"[{elapsed:7.1f} mp] {stats.summary(args.confidence)}", flush=True)
+
+        stats, reason = run_sequential(args.precision, args.time_budget, args.rounds,
+                                       args.workers, confidence=args.confidence,
+                                       check_every=args.check_every, progress=report,
+                                       **options)
+        print(f"Leállás: {STOP_REASONS[reason]}")
+    else:
+        stats = run_simulation(args.rounds or 1000000, args.workers, **options)
+
+    for key, value in stats.as_dict().items():
+        print(f"{key}: {value}")
+    low, high = stats.confidence_interval(args.confidence)
+    print(f"{args.confidence:.0%} konfidenciaintervallum: [{low:+.5f}, {high:+.5f}] egység/kör")
+    for key, count in stats.counts().items():
+        print(f"{key}_rate: {stats.rate(count):.4%} "
+              f"± {stats.rate_half_width(count, args.confidence):.4%}")
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Alapstratégia a játék szabályaihoz: az osztó minden 17-en megáll,
+# duplázni csak 9-11-re lehet, split után is, az ászok split után egy
+# lapot kapnak, és az osztó blackjackje a teljes (duplázott, splittelt)
+# tétet viszi. Más asztalváltozatra (engine.RULE_SETS) a generátor
+# készít táblát: python strategy.py --rules vegas_h17
+
+import argparse
+import hashlib
+import json
+import os
+
+from engine import HIT, STAND, DOUBLE, SPLIT, SURRENDER, CLASSIC_RULES, RULE_SETS, get_rules
+from probability import (FINAL_BUST, FINAL_BLACKJACK, dealer_probabilities,
+                         remove_card, shoe_composition)
+
+# Oszlopok: az osztó felfordított lapja 2, 3, 4, 5, 6, 7, 8, 9, 10, A
+UPCARDS = (2, 3, 4, 5, 6, 7, 8, 9, 10, 11)
+
+ACTION_CODES = {'H': HIT, 'S': STAND, 'D': DOUBLE, 'P': SPLIT, 'R': SURRENDER}
+
+# Kemény összegek (4-21)
+HARD_STRATEGY = {
+    4: "HHHHHHHHHH",
+    5: "HHHHHHHHHH",
+    6: "HHHHHHHHHH",
+    7: "HHHHHHHHHH",
+    8: "HHHHHHHHHH",
+    9: "HDDDDHHHHH",
+    10: "DDDDDDDDHH",
+    11: "DDDDDDDDDH",
+    12: "HHSSSHHHHH",
+    13: "SSSSSHHHHH",
+    14: "SSSSSHHHHH",
+    15: "SSSSSHHHHH",
+    16: "SSSSSHHHHH",
+    17: "SSSSSSSSSS",
+    18: "SSSSSSSSSS",
+    19: "SSSSSSSSSS",
+    20: "SSSSSSSSSS",
+    21: "SSSSSSSSSS",
+}
+
+# Lágy összegek (12-21), lágy kézre duplázni nem lehet
+SOFT_STRATEGY = {
+    12: "HHHHHHHHHH",
+    13: "HHHHHHHHHH",
+    14: "HHHHHHHHHH",
+    15: "HHHHHHHHHH",
+    16: "HHHHHHHHHH",
+    17: "HHHHHHHHHH",
+    18: "SSSSSSSHHH",
+    19: "SSSSSSSSSS",
+    20: "SSSSSSSSSS",
+    21: "SSSSSSSSSS",
+}
+
+# Párok a lap értéke szerint (10 = bármely tízes értékű lap, 11 = ász);
+# ahol nincs split, a kemény vagy lágy táblázat dönt
+PAIR_STRATEGY = {
+    2: "PPPPPPHHHH",
+    3: "PPPPPPHHHH",
+    4: "HHHPPHHHHH",
+    5: "HHHHHHHHHH",
+    6: "PPPPPHHHHH",
+    7: "PPPPPPHHHH",
+    8: "PPPPPPPPHH",
+    9: "PPPPPSPPSS",
+    10: "SSSSSSSSSS",
+    11: "PPPPPPPPPP",
+}
+
+def build_table(strategy, size, fallback=False):
+    # Tömör keresőtábla: table[összeg][felfordított lap értéke] -> döntés.
+    # A generált táblák duplázás- és feladáscellái tartalékot is hordoznak
+    # ("Dh", "Ds", "Rh", "Rs", mint a stratégiakártyákon); fallback=True
+    # esetén a tábla ezt adja, arra az esetre, ha a döntés már nem szabályos
+    table = [[STAND] * 12 for _ in range(size)]
+    for total, row in strategy.items():
+        for upcard, code in zip(UPCARDS, row):
+            table[total][upcard] = ACTION_CODES[code[-1].upper() if fallback else code[0]]
+    return table
+
+HARD_TABLE = build_table(HARD_STRATEGY, 22)
+SOFT_TABLE = build_table(SOFT_STRATEGY, 22)
+PAIR_TABLE = build_table(PAIR_STRATEGY, 12)
+
+def basic_strategy_policy(hand, upcard):
+    up = upcard.points
+
+    if hand.can_split():
+        action = PAIR_TABLE[hand.cards[0].points][up]
+        if action == SPLIT:
+            return SPLIT
+
+    total = hand.calculate_value()
+    if total > 21:
+        return STAND
+    if hand.is_soft():
+        return SOFT_TABLE[total][up]
+    return HARD_TABLE[total][up]
+
+# --- Stratégia-generátor ---------------------------------------------------
+# A hit, stand, double és split várható értékét (egységnyi tétre) számolja
+# minden kézre és felfordított lapra, a probability modul pontos osztói
+# eloszlásaival. A lapvalószínűségeket egy kézen belül rögzítettnek
+# tekinti (összeg-alapú közelítés), split után újraosztást nem számol.
+
+# A játék tényleges szabályai, a generált táblák gyorsítótár-kulcsa is.
+# A split-korlátokat (max_split_hands, resplit_aces) a számítás nem
+# modellezi, a feladás (surrender) csak a kezdő két lapra él.
+GAME_RULES = CLASSIC_RULES
+
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'blackjack')
+
+class EVCalculator:
+    # Egy felfordított lap és összetétel melletti várható értékek
+    def __init__(self, rules, composition, upcard):
+        self.rules = rules
+        remaining = sum(composition)
+        self.card_probabilities = [(index + 2, count / remaining)
+                                   for index, count in enumerate(composition) if count]
+        self.dealer = dealer_probabilities(upcard, composition, rules['dealer_hits_soft_17'])
+        self.stand_values = [self.calculate_stand(total) for total in range(22)]
+        self.hit_values = {}
+
+    def calculate_stand(self, total):
+        dealer = self.dealer
+        ev = dealer[FINAL_BUST] - dealer[FINAL_BLACKJACK]
+        for final in range(17, 22):
+            if total > final:
+                ev += dealer[final - 17]
+            elif total < final:
+                ev -= dealer[final - 17]
+        return ev
+
+    def stand(self, total):
+        return self.stand_values[total] if total <= 21 else -1.0
+
+    def blackjack(self):
+        # Osztói bust ellen a blackjack is csak 1:1-et fizet (check_winners)
+        dealer = self.dealer
+        others = 1.0 - dealer[FINAL_BUST] - dealer[FINAL_BLACKJACK]
+        return dealer[FINAL_BUST] + others * self.rules['blackjack_payout']
+
+    def draw(self, hard_value, aces):
+        # (valószínűség, új kemény összeg, ász van-e) a következő lapra
+        for points, probability in self.card_probabilities:
+            if points == 11:
+                yield probability, hard_value + 1, True
+            else:
+                yield probability, hard_value + points, aces
+
+    def hit(self, hard_value, aces):
+        # Egy lap, utána a jobbik a megállás és a további lapkérés közül
+        key = (hard_value, aces)
+        if key in self.hit_values:
+            return self.hit_values[key]
+
+        ev = 0.0
+        for probability, new_hard, new_aces in self.draw(hard_value, aces):
+            if new_hard > 21:
+                ev -= probability
+            else:
+                total = hand_total(new_hard, new_aces)
+                ev += probability * max(self.stand(total), self.hit(new_hard, new_aces))
+
+        self.hit_values[key] = ev
+        return ev
+
+    def double(self, hard_value, aces):
+        ev = 0.0
+        for probability, new_hard, new_aces in self.draw(hard_value, aces):
+            ev += probability * self.stand(hand_total(new_hard, new_aces))
+        return 2 * ev
+
+    def actions(self, hard_value, aces, can_double, can_surrender=False):
+        total = hand_total(hard_value, aces)
+        values = {'S': self.stand(total), 'H': self.hit(hard_value, aces)}
+        if can_double and total in self.rules['double_totals']:
+            values['D'] = self.double(hard_value, aces)
+        if can_surrender and self.rules['surrender']:
+            # Peek nélkül az osztó blackjackje ellen is a tét fele marad
+            values['R'] = -0.5
+        return values
+
+    def split(self, points):
+        # Mindkét kéz egy-egy lapot kap; split ászok csak egyet
+        rules = self.rules
+        base = 1 if points == 11 else points
+        ev = 0.0
+        for probability, hard_value, aces in self.draw(base, points == 11):
+            total = hand_total(hard_value, aces)
+            if total == 21 and rules['split_21_is_blackjack']:
+                hand_ev = self.blackjack()
+            elif points == 11 and rules['split_aces_one_card']:
+                hand_ev = self.stand(total)
+            else:
+                hand_ev = max(self.actions(hard_value, aces, rules['double_after_split']).values())
+            ev += probability * hand_ev
+        return 2 * ev
+
+def table_code(values):
+    # A legjobb döntés táblakódja; duplázásnál és feladásnál a legjobb
+    # lapkérés/megállás tartalékként mögé kerül (pl. "Rh")
+    action = best_action(values)
+    if action in ('D', 'R'):
+        fallback = best_action({code: values[code] for code in ('H', 'S')})
+        return action + fallback.lower()
+    return action
+
+def hand_total(hard_value, aces):
+    return hard_value + 10 if aces and hard_value <= 11 else hard_value
+
+def best_action(values):
+    return max(values, key=values.get)
+
+def two_card_action(calculator, first, second):
+    # Egy konkrét két lapos kéz legjobb döntése (blackjacknél mindig S)
+    hard_value = (1 if first == 11 else first) + (1 if second == 11 else second)
+    aces = first == 11 or second == 11
+    if hand_total(hard_value, aces) == 21:
+        return 'S'
+
+    values = calculator.actions(hard_value, aces, True, True)
+    if first == second:
+        values['P'] = calculator.split(first)
+    return best_action(values)
+
+def generate_strategy(rules=GAME_RULES, decks=6, deviations=False):
+    # rules: szabályszótár, RuleSet vagy változatnév
+    rules = get_rules(rules).rules
+    full = shoe_composition(decks)
+    strategy = {'hard': {}, 'soft': {}, 'pairs': {}, 'deviations': {}}
+
+    for column, upcard in enumerate(UPCARDS):
+        calculator = EVCalculator(rules, remove_card(full, upcard), upcard)
+
+        for total in range(4, 22):
+            values = calculator.actions(total, False, total <= 20, total <= 20)
+            strategy['hard'].setdefault(total, [''] * 10)[column] = table_code(values)
+
+        for total in range(12, 22):
+            values = calculator.actions(total - 10, True, True, True)
+            strategy['soft'].setdefault(total, [''] * 10)[column] = table_code(values)
+
+        for points in UPCARDS:
+            strategy['pairs'].setdefault(points, [''] * 10)[column] = two_card_action(
+                calculator, points, points)
+
+    if deviations:
+        strategy['deviations'] = generate_deviations(rules, full, strategy)
+    return strategy
+
+def table_action(strategy, first, second, upcard):
+    # Mit mondana az összeg-alapú tábla erre a két lapos kézre
+    column = UPCARDS.index(upcard)
+    if first == second and strategy['pairs'][first][column] == 'P':
+        return 'P'
+    hard_value = (1 if first == 11 else first) + (1 if second == 11 else second)
+    aces = first == 11 or second == 11
+    total = hand_total(hard_value, aces)
+    if aces and hard_value <= 11:
+        return strategy['soft'][total][column][0]
+    return strategy['hard'][total][column][0]
+
+def generate_deviations(rules, full, strategy):
+    # Összetétel-függő eltérések: a két lap és a felfordított lap kivétele
+    # után számolt legjobb döntés, ahol eltér a táblától
+    result = {}
+    for upcard in UPCARDS:
+        for first in UPCARDS:
+            for second in UPCARDS[UPCARDS.index(first):]:
+                composition = remove_card(remove_card(remove_card(full, upcard), first), second)
+                if min(composition) < 0:
+                    continue
+                calculator = EVCalculator(rules, composition, upcard)
+                action = two_card_action(calculator, first, second)
+                if action != table_action(strategy, first, second, upcard):
+                    result[f"{first},{second},{upcard}"] = action
+    return result
+
+# A gyorsítótárazott táblák formátuma (2: cellánkénti tartalék, pl. "Rh")
+STRATEGY_FORMAT = 2
+
+def rules_key(rules, decks, deviations):
+    data = json.dumps({'rules': rules, 'decks': decks, 'deviations': deviations,
+                       'format': STRATEGY_FORMAT}, sort_keys=True)
+    return hashlib.sha256(data.encode()).hexdigest()[:16]
+
+def load_strategy(rules=GAME_RULES, decks=6, deviations=False, cache_dir=CACHE_DIR):
+    # Gyorsítótárból töltünk, ha van; különben generálunk és elmentjük
+    rules = get_rules(rules).rules
+    path = os.path.join(cache_dir, f"strategy-{rules_key(rules, decks, deviations)}.json")
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as cache_file:
+            data = json.load(cache_file)
+        # A JSON kulcsok szövegek, a táblák kulcsai összegek
+        for table in ('hard', 'soft', 'pairs'):
+            data[table] = {int(key): row for key, row in data[table].items()}
+        return data
+
+    strategy = generate_strategy(rules, decks, deviations)
+    os.makedirs(cache_dir, exist_ok=True)
+    temporary = path + '.tmp'
+    with open(temporary, 'w', encoding='utf-8') as cache_file:
+        json.dump(strategy, cache_file, separators=(',', ':'))
+    os.replace(temporary, path)
+    return strategy
+
+class StrategyPolicy:
+    # Generált táblákból készült policy; modulszintű osztály, így a
+    # szimulációs workereknek is átadható
+    def __init__(self, strategy):
+        self.hard_table = build_table(strategy['hard'], 22)
+        self.soft_table = build_table(strategy['soft'], 22)
+        self.pair_table = build_table(strategy['pairs'], 12)
+        self.hard_fallback = build_table(strategy['hard'], 22, fallback=True)
+        self.soft_fallback = build_table(strategy['soft'], 22, fallback=True)
+        self.deviations = {}
+        for key, code in strategy.get('deviations', {}).items():
+            first, second, upcard = (int(part) for part in key.split(','))
+            self.deviations[(first, second, upcard)] = ACTION_CODES[code]
+
+    def __call__(self, hand, upcard):
+        up = upcard.points
+        cards = hand.cards
+
+        if self.deviations and len(cards) == 2:
+            first, second = sorted((cards[0].points, cards[1].points))
+            action = self.deviations.get((first, second, up))
+            if action is not None and not (action == SURRENDER and hand.is_split):
+                return action
+
+        if hand.can_split():
+            if self.pair_table[cards[0].points][up] == SPLIT:
+                return SPLIT
+
+        total = hand.calculate_value()
+        if total > 21:
+            return STAND
+        soft = hand.is_soft()
+        action = (self.soft_table if soft else self.hard_table)[total][up]
+
+        # Duplázni és feladni csak a kezdő két lapra lehet (feladni split
+        # után sem); ilyenkor a cella tartaléka érvényes
+        if action == DOUBLE or action == SURRENDER:
+            if len(cards) != 2 or (action == SURRENDER and hand.is_split):
+                action = (self.soft_fallback if soft else self.hard_fallback)[total][up]
+        return action
+
+def rules_policy(rules=None):
+    # Az asztalváltozathoz illő stratégia: a klasszikus szabályokra a kézzel
+    # írt alapstratégia, a többire a generált (gyorsítótárazott) tábla
+    rules = get_rules(rules)
+    if rules is RULE_SETS['classic']:
+        return basic_strategy_policy
+    return StrategyPolicy(load_strategy(rules))
+
+def format_strategy(strategy):
+    lines = ["      " + " ".join(f"{upcard:>2}" for upcard in UPCARDS)]
+    for title, table in (('H', strategy['hard']), ('S', strategy['soft']), ('P', strategy['pairs'])):
+        for key in sorted(table):
+            lines.append(f"{title}{key:>3}:  " + " ".join(f"{code:>2}" for code in table[key]))
+    for key, code in sorted(strategy['deviations'].items()):
+        lines.append(f"eltérés {key}: {code}")
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Alapstratégia generálása")
+    parser.add_argument('--decks', type=int, default=6)
+    parser.add_argument('--deviations', action='store_true')
+    parser.add_argument('--rules', choices=sorted(RULE_SETS), default='classic',
+                        help="Asztalváltozat")
+    args = parser.parse_args()
+
+    print(format_strategy(load_strategy(args.rules, args.decks, args.deviations)))
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Körfolyam: a motor körei egyenként, tömör elszámolt rekordokként jönnek
+# (handlog.LoggedRound: lapok, döntések, tétek, check_winners-eredmények,
+# kifizetések, nettó), listába gyűjtés nélkül. A rekord ugyanaz, amit a
+# naplóolvasó ad, így élő folyam és felvett napló ugyanúgy feldolgozható.
+#
+# A feldolgozók (szűrő, összesítő, író, darabolás) lépcsőkként fűzhetők
+# egymás után. Minden lépcső húzással kéri az előzőtől a következő
+# rekordot, így a forrás sosem fut a fogyasztó elé (visszanyomás), és a
+# memória a lejátszott körök számától független.
+#
+#   python stream.py --rounds 100000000 --progress 1000000
+#   python stream.py --rounds 1000000 --where split --output splitek.bjl
+
+import argparse
+import random
+import time
+from collections import deque
+from itertools import count, islice
+
+from core import make_shoe
+from engine import RoundEngine, RULE_SETS, DOUBLE, SPLIT, PLAYER_BLACKJACK, NO_HISTORY
+from handlog import LoggedRound, HandLogWriter
+from simulation import SimulationStats
+from strategy import basic_strategy_policy
+
+def round_record(game_round, number):
+    # Egy elszámolt kör tömör rekordja; a Round objektum utána eldobható.
+    # Csak körtörténettel játszott körből készülhet (RoundEngine(record=True))
+    if game_round.dealt is NO_HISTORY:
+        raise ValueError("A kör történet nélkül futott (RoundEngine record=True kell)")
+    record = LoggedRound(number)
+    record.cards = [card.index for card in game_round.dealt]
+    record.actions = game_round.actions
+    record.bets = [hand.bet for hand in game_round.hands]
+    record.outcomes = game_round.outcomes
+    record.payouts = game_round.payouts
+    record.net = game_round.net()
+    return record
+
+def stream_rounds(engine, rounds=None, bet=1, policy=None, start=0):
+    # rounds=None: végtelen folyam, a fogyasztó állítja le (pl. take). A
+    # motornak körtörténetet kell rögzítenie; ezt már híváskor ellenőrizzük.
+    if not engine.record:
+        raise ValueError("A folyamhoz körtörténet kell: RoundEngine(..., record=True)")
+    numbers = count(start) if rounds is None else range(start, start + rounds)
+    return (round_record(engine.play_round(bet, policy), number) for number in numbers)
+
+# --- Lépcsők -----------------------------------------------------------------
+# Egy lépcső iterátort kap és lusta iterátort ad vissza.
+
+def pipeline(source, *stages):
+    for stage in stages:
+        source = stage(source)
+    return source
+
+def where(predicate):
+    # Szűrő: csak a feltételnek megfelelő rekordok mennek tovább
+    def stage(records):
+        for record in records:
+            if predicate(record):
+                yield record
+    return stage
+
+def tap(consumer):
+    # Összesítő vagy író: a rekordot megkapja, majd változatlanul továbbadja
+    def stage(records):
+        for record in records:
+            consumer(record)
+            yield record
+    return stage
+
+def batches(size):
+    # Legfeljebb size rekordos listák; a memória a darabmérettel korlátos
+    def stage(records):
+        iterator = iter(records)
+        while True:
+            chunk = list(islice(iterator, size))
+            if not chunk:
+                return
+            yield chunk
+    return stage
+
+def take(limit):
+    def stage(records):
+        return islice(records, limit)
+    return stage
+
+def drain(records):
+    # A folyam végigfuttatása a rekordok megtartása nélkül
+    deque(records, maxlen=0)
+
+# Szűrőfeltételek a parancssorhoz
+def has_split(record):
+    return any(action == SPLIT for _, action in record.actions)
+
+def has_double(record):
+    return any(action == DOUBLE for _, action in record.actions)
+
+def has_blackjack(record):
+    return PLAYER_BLACKJACK in record.outcomes
+
+def is_loss(record):
+    return record.net < 0
+
+FILTERS = {
+    'split': has_split,
+    'double': has_double,
+    'blackjack': has_blackjack,
+    'loss': is_loss,
+}
+
+def peak_memory_mb():
+    # A folyamat csúcs memóriája (RSS), ahol a platform ismeri
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def memory_text():
+    peak = peak_memory_mb()
+    return f"{peak:.1f} MB" if peak is not None else "ismeretlen"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Körök folyamként, korlátos memóriával")
+    parser.add_argument('--rounds', type=int, default=1000000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--bet', type=float, default=1.0)
+    parser.add_argument('--decks', type=int, default=6)
+    parser.add_argument('--penetration', type=float, default=0.75)
+    parser.add_argument('--rules', choices=sorted(RULE_SETS), default='classic',
+                        help="Asztalváltozat")
+    parser.add_argument('--csm', type=int, nargs='?', const=0, metavar='HOLDBACK',
+                        help="Folyamatos keverőgép, ennyi visszatartott lappal (alapból 0)")
+    parser.add_argument('--where', choices=sorted(FILTERS), help="Csak az ilyen körök")
+    parser.add_argument('--output', help="A kiválasztott körök leosztásnaplóba")
+    parser.add_argument('--progress', type=int, default=0,
+                        help="Állapotsor ennyi körönként (0 = nincs)")
+    args = parser.parse_args()
+
+    try:
+        shoe = make_shoe(args.decks, args.penetration, random.Random(args.seed), args.csm)
+    except ValueError as error:
+        parser.error(str(error))
+    engine = RoundEngine(shoe, basic_strategy_policy, args.rules, record=True)
+    total = SimulationStats()
+    selected = SimulationStats()
+
+    def report(record):
+        # Állapotsor: a csúcs memória a futás végéig sem nő
+        if total.rounds % args.progress == 0:
+            elapsed = time.perf_counter() - started
+            print(f"{total.rounds:,} kör, {total.rounds / elapsed:,.0f} kör/s, "
+                  f"csúcs memória: {memory_text()}")
+
+    stages = [tap(total.add_record)]
+    if args.progress:
+        stages.append(tap(report))
+    if args.where:
+        stages.append(where(FILTERS[args.where]))
+    stages.append(tap(selected.add_record))
+    writer = HandLogWriter(args.output) if args.output else None
+    if writer is not None:
+        stages.append(tap(writer.write_record))
+
+    started = time.perf_counter()
+    drain(pipeline(stream_rounds(engine, args.rounds, args.bet), *stages))
+    elapsed = time.perf_counter() - started
+    if writer is not None:
+        writer.close()
+
+    for key, value in total.as_dict().items():
+        print(f"{key}: {value}")
+    if args.where:
+        print(f"kiválasztott körök ({args.where}): {selected.rounds}, nettó: {selected.net}")
+    print(f"{total.rounds / elapsed:,.0f} kör/s, csúcs memória: {memory_text()}")